@@ -0,0 +1,102 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+# Compares the struct based frame codec with the former hex string path.
+# Run from the repository root: python3 benchmarks/codec_bench.py
+
+import binascii
+import importlib.util
+import os
+import timeit
+from textwrap import wrap
+
+CODEC_PATH = os.path.join(os.path.dirname(__file__), '..', 'custom_components', 'ready4sky', 'codec.py')
+
+spec = importlib.util.spec_from_file_location('codec', CODEC_PATH)
+codec = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(codec)
+
+NUMBER = 100000
+
+# GET_STATUS_MODE responses as sent by the devices, 20 bytes each
+FRAMES = {
+    0: bytes.fromhex('550706' '00005a000000000002005c0000000000' 'aa'),
+    1: bytes.fromhex('550706' '00005a00015200000200000000000000' 'aa'),
+    3: bytes.fromhex('550706' '00000300000000000200000100000000' 'aa'),
+    4: bytes.fromhex('550706' '00000000000000000200000000000000' 'aa'),
+    5: bytes.fromhex('550706' '01006401000023000200000000000000' 'aa'),
+}
+
+
+def hexToDec(hexStr: str) -> int:
+    return int.from_bytes(binascii.a2b_hex(bytes(hexStr, 'utf-8')), 'little')
+
+
+def legacyDecode(devType, data):
+    arrHex = wrap(binascii.b2a_hex(data).decode('utf-8'), 2)
+
+    if devType == 0:
+        return hexToDec(arrHex[13]), arrHex[11], arrHex[3], hexToDec(arrHex[5])
+    elif devType in [1, 2]:
+        return hexToDec(arrHex[8]), arrHex[11], arrHex[3], hexToDec(arrHex[5]), hexToDec(arrHex[7]) == 1
+    elif devType == 3:
+        return arrHex[11], arrHex[5], arrHex[14]
+    elif devType == 4:
+        return arrHex[11], arrHex[3]
+
+    return (
+        arrHex[3], arrHex[4], hexToDec(arrHex[5]), hexToDec(arrHex[6]), hexToDec(arrHex[7]),
+        hexToDec(arrHex[8]), hexToDec(arrHex[9]), arrHex[10], arrHex[11]
+    )
+
+
+def codecDecode(devType, data):
+    return codec.decodeStatus(devType, codec.decodeFrame(data).payload)
+
+
+def decToHex(num: int) -> str:
+    return num.to_bytes((num.bit_length() + 7) // 8, 'little').hex() or '00'
+
+
+def legacyEncode(iterNum=7, mode=1, temp=90):
+    value = '55' + decToHex(iterNum) + '05' + decToHex(mode) + '00' + decToHex(temp) + '00000000000000000000800000' + 'aa'
+    return binascii.a2b_hex(bytes(value, 'utf-8'))
+
+
+def codecEncode(iterNum=7, mode=1, temp=90):
+    return codec.encodeFrame(iterNum, 0x05, codec.MODE_KETTLE_EXT.pack(mode, temp, 0x80))
+
+
+FRAMES_BUILDER = codec.FrameBuilder()
+
+
+def templateEncode(iterNum=7, mode=1, temp=90):
+    return FRAMES_BUILDER.pack(iterNum, 0x05, codec.MODE_KETTLE_EXT, mode, temp, 0x80)
+
+
+def report(name, legacy, current):
+    legacyTime = timeit.timeit(legacy, number=NUMBER)
+    currentTime = timeit.timeit(current, number=NUMBER)
+
+    print('%-22s legacy %7.3f us  codec %7.3f us  x%.1f' % (
+        name,
+        legacyTime / NUMBER * 1e6,
+        currentTime / NUMBER * 1e6,
+        legacyTime / currentTime
+    ))
+
+
+def main():
+    for devType, data in FRAMES.items():
+        report(
+            'decode status type %d' % devType,
+            lambda: legacyDecode(devType, data),
+            lambda: codecDecode(devType, data)
+        )
+
+    report('encode set mode', legacyEncode, codecEncode)
+    report('encode set mode tpl', legacyEncode, templateEncode)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,72 @@
 #!/usr/local/bin/python3
 # coding: utf-8
 
-import asyncio
 import logging
+import math
 import time
-from datetime import (timedelta)
-from enum import Enum
+from datetime import (datetime, timedelta, timezone)
+from enum import IntEnum
 
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONF_MAC,
     CONF_PASSWORD,
-    CONF_SCAN_INTERVAL
+    CONF_SCAN_INTERVAL,
+    UnitOfEnergy
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import async_track_time_interval
-
-from .btle import BTLEConnection
+from homeassistant.helpers.event import (async_call_later, async_track_time_interval)
+
+from . import codec
+from .backoff import CircuitOpenError
+from .btle import (
+    BTLEConnection,
+    CONNECTION_IDLE,
+    DEFAULT_IDLE_TIMEOUT
+)
+from .heating import (HeatingEstimator, BOIL_TEMP, KEEP_WARM_HYSTERESIS)
+from .history import (EnergyHistory, hourlyTotals, readHistory)
+from .polling import (
+    PollLane,
+    PollPhases,
+    PollScheduler,
+    DEFAULT_STATS_INTERVAL,
+    DEFAULT_SYNC_INTERVAL,
+    POLL_FAST_INTERVAL,
+    POLL_IDLE_FACTOR,
+    POLL_IDLE_MAX,
+    POLL_SETUP_PERIOD
+)
+from .progress import CookerProgress
+from .profiles import (
+    getProfile,
+    CAP_BACKLIGHT,
+    CAP_CLOCK,
+    CAP_COOKER,
+    CAP_FAN,
+    CAP_ION,
+    CAP_KETTLE,
+    CAP_NIGHTLIGHT,
+    CAP_RUN,
+    CAP_SOUND,
+    CAP_TEMPERATURE
+)
+from .scheduler import ConnectionScheduler
+from .state import (DeviceState, STATE_FIELDS)
+from .tracing import (TraceRecorder, DEFAULT_MAX_BYTES)
+from .commands import (
+    CommandQueue,
+    queued,
+    COMMAND_POLL,
+    COMMAND_MODE,
+    COMMAND_TEMPERATURE,
+    COMMAND_TIMER,
+    COMMAND_ION,
+    COMMAND_SOUND
+)
 
 DOMAIN = "ready4sky"
 SUPPORTED_DOMAINS = [
@@ -29,47 +77,208 @@ SUPPORTED_DOMAINS = [
     "fan"
 ]
 SIGNAL_UPDATE_DATA = 'ready4skyupdate'
+DATA_SCHEDULER = DOMAIN + '_scheduler'
+DATA_TRACER = DOMAIN + '_tracer'
+DATA_PHASES = DOMAIN + '_phases'
+
+SERVICE_START_TRACE = 'start_trace'
+SERVICE_STOP_TRACE = 'stop_trace'
+TRACE_FILE = 'ready4sky_trace.bin'
+TRACE_FLUSH_INTERVAL = timedelta(seconds=5)
+PROGRESS_INTERVAL = timedelta(minutes=1)
+
+SERVICE_IMPORT_ENERGY = 'import_energy_statistics'
+ENERGY_FILE = 'ready4sky_energy_%s.bin'
 
 CONF_USE_BACKLIGHT = 'use_backlight'
+CONF_CONNECTION_MODE = 'connection_mode'
+CONF_IDLE_TIMEOUT = 'idle_timeout'
+CONF_STATS_INTERVAL = 'stats_interval'
+CONF_SYNC_INTERVAL = 'sync_interval'
+CONF_OPTIMISTIC = 'optimistic'
+CONF_CONNECTION_SLOTS = 'connection_slots'
+
+CONFIRM_DELAY = 2
+
+STEP_STOP = 'stop'
+STEP_LIGHTS = 'lights'
+STEP_MODE = 'mode'
+STEP_RUN = 'run'
 
 CONF_MIN_TEMP = 35
 CONF_MAX_TEMP = 90
 
-STATUS_OFF = '00'
-STATUS_ON = '02'
+STATUS_OFF = 0
+STATUS_ON = 2
 
-COOKER_STATUS_PROGRAM = '01'
-COOKER_STATUS_KEEP_WARM = '04'
-COOKER_STATUS_DELAYED_START = '05'
+COOKER_STATUS_PROGRAM = 1
+COOKER_STATUS_KEEP_WARM = 4
+COOKER_STATUS_DELAYED_START = 5
 
-MODE_BOIL = '00'
-MODE_KEEP_WARM = '01'
-MODE_LIGHT = '03'
+MODE_BOIL = 0
+MODE_KEEP_WARM = 1
+MODE_LIGHT = 3
 
 ATTR_WORK_ALLTIME = 'Working time (h)'
 ATTR_TIMES = 'Number starts'
 ATTR_SYNC = 'Last sync'
 ATTR_TIMER_SET = 'Timer set'
 ATTR_TIMER_CURR = 'Timer current'
+ATTR_CONNECTION_QUEUE = 'Connection queue'
+ATTR_RSSI = 'RSSI'
+ATTR_SKIPPED_POLLS = 'Skipped polls'
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup(hass, config):
     hass.data.setdefault(DOMAIN, {})
+    hass.data.setdefault(DATA_SCHEDULER, ConnectionScheduler(hass))
+    hass.data.setdefault(DATA_PHASES, PollPhases(hass))
+
+    async def handleStartTrace(call):
+        await startTrace(hass, call.data.get('max_bytes', DEFAULT_MAX_BYTES))
+
+    async def handleStopTrace(call):
+        await stopTrace(hass)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_TRACE,
+        handleStartTrace,
+        vol.Schema({
+            vol.Optional('max_bytes'): vol.All(vol.Coerce(int), vol.Range(min=4096))
+        })
+    )
+    hass.services.async_register(DOMAIN, SERVICE_STOP_TRACE, handleStopTrace)
+
+    async def handleImportEnergy(call):
+        for kettle in hass.data[DOMAIN].values():
+            await importEnergyStatistics(hass, kettle)
+
+    hass.services.async_register(DOMAIN, SERVICE_IMPORT_ENERGY, handleImportEnergy)
+
     return True
 
 
+async def startTrace(hass, maxBytes=DEFAULT_MAX_BYTES):
+    await stopTrace(hass)
+
+    tracer = TraceRecorder(hass.config.path(TRACE_FILE), maxBytes)
+
+    async def flushTrace(now):
+        await tracer.async_flush(hass)
+
+    hass.data[DATA_TRACER] = (tracer, async_track_time_interval(hass, flushTrace, TRACE_FLUSH_INTERVAL))
+
+    for kettle in hass.data[DOMAIN].values():
+        kettle._conn.setTracer(tracer)
+
+    _LOGGER.info('Protocol trace started: %s', tracer.path)
+
+
+async def stopTrace(hass):
+    if hass.data.get(DATA_TRACER) is None:
+        return
+
+    tracer, unsubFlush = hass.data.pop(DATA_TRACER)
+    unsubFlush()
+
+    for kettle in hass.data[DOMAIN].values():
+        kettle._conn.setTracer(None)
+
+    await tracer.async_flush(hass)
+
+    _LOGGER.info('Protocol trace stopped: %s', tracer.path)
+
+
+async def importEnergyStatistics(hass, kettle):
+    # the recorder is only needed here, it is loaded with the first import
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.models import (StatisticData, StatisticMetaData)
+    from homeassistant.components.recorder.statistics import (async_add_external_statistics, get_last_statistics)
+
+    if kettle._history is None:
+        return
+
+    await kettle._history.async_flush(hass)
+    samples = await hass.async_add_executor_job(readHistory, kettle._history.path)
+    statisticId = '%s:energy_%s' % (DOMAIN, kettle._mac.replace(':', '').lower())
+
+    # only hours after the last imported one are added, their sum goes on from its sum
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statisticId, True, {'state', 'sum'}
+    )
+    after, total, watts = None, 0, None
+
+    if last.get(statisticId):
+        row = last[statisticId][0]
+        after = row['start'].timestamp() if isinstance(row['start'], datetime) else row['start']
+        total = row['sum'] or 0
+        watts = row['state']
+
+    rows = hourlyTotals(samples, after, total, watts)
+
+    if not rows:
+        return
+
+    metadata = StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=f'{kettle._name} Energy',
+        source=DOMAIN,
+        statistic_id=statisticId,
+        unit_of_measurement=UnitOfEnergy.WATT_HOUR
+    )
+
+    # all new hours go to the recorder in one job
+    async_add_external_statistics(hass, metadata, [
+        StatisticData(start=datetime.fromtimestamp(hour, timezone.utc), state=watts, sum=total)
+        for hour, watts, total in rows
+    ])
+
+    _LOGGER.info('Imported %d new hours of energy statistics as %s', len(rows), statisticId)
+
+
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     config = config_entry.data
     mac = str(config.get(CONF_MAC)).upper()
     password = config.get(CONF_PASSWORD)
-    scan_delta = timedelta(seconds=config.get(CONF_SCAN_INTERVAL))
+    scan_interval = config.get(CONF_SCAN_INTERVAL)
     backlight = config.get(CONF_USE_BACKLIGHT)
-
-    kettler = RedmondKettle(hass, mac, password, backlight)
+    connectionMode = config.get(CONF_CONNECTION_MODE, CONNECTION_IDLE)
+    idleTimeout = config.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+    statsInterval = config.get(CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL)
+    syncInterval = config.get(CONF_SYNC_INTERVAL, DEFAULT_SYNC_INTERVAL)
+    optimistic = config.get(CONF_OPTIMISTIC, False)
+    slots = config.get(CONF_CONNECTION_SLOTS, 0)
+
+    scheduler = hass.data.setdefault(DATA_SCHEDULER, ConnectionScheduler(hass))
+
+    kettler = RedmondKettle(
+        hass,
+        mac,
+        password,
+        backlight,
+        connectionMode,
+        idleTimeout,
+        scheduler,
+        statsInterval,
+        syncInterval,
+        optimistic,
+        slots
+    )
     await kettler.setNameAndType()
 
+    history = EnergyHistory(hass.config.path(ENERGY_FILE % mac.replace(':', '').lower()))
+
+    try:
+        await hass.async_add_executor_job(history.load)
+    except OSError as ex:
+        _LOGGER.warning('Energy history of %s not loaded: %s', mac, ex)
+
+    kettler.setHistory(history)
+
     try:
         await kettler.firstConnect()
     except BaseException as ex:
@@ -93,7 +302,13 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         sw_version=kettler._firmware_ver
     )
 
-    async_track_time_interval(hass, hass.data[DOMAIN][config_entry.entry_id].update, scan_delta)
+    if hass.data.get(DATA_TRACER) is not None:
+        kettler._conn.setTracer(hass.data[DATA_TRACER][0])
+
+    kettler.startTracking()
+    config_entry.async_on_unload(kettler.stopTracking)
+    kettler.startPolling(scan_interval, hass.data.setdefault(DATA_PHASES, PollPhases(hass)))
+    config_entry.async_on_unload(kettler.stopPolling)
 
     for component in SUPPORTED_DOMAINS:
         hass.async_create_task(hass.config_entries.async_forward_entry_setup(config_entry, component))
@@ -105,165 +320,186 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     try:
         for component in SUPPORTED_DOMAINS:
             await hass.config_entries.async_forward_entry_unload(entry, component)
-        hass.data[DOMAIN].pop(entry.entry_id)
+        kettler = hass.data[DOMAIN].pop(entry.entry_id)
     except ValueError:
-        pass
+        return True
+
+    # always and push connections stay open by themselves and hold their adapter slot
+    kettler.stopPolling()
+    kettler._commands.stop()
+    await kettler._conn.disconnect()
+
     return True
 
 
-class RedmondCommand(Enum):
-    AUTH = 'ff'
-    VERSION = '01'
-    RUN_CURRENT_MODE = '03'  # sendOn
-    STOP_CURRENT_MODE = '04'  # sendOff
-    SET_STATUS_MODE = '05'  # sendMode
-    GET_STATUS_MODE = '06'
-    SET_DELAY = '08'
-    SET_COLOR = '32'  # sendSetLights
-    GET_COLOR = '33'  # sendGetLights
-    SET_BACKLIGHT_MODE = '37'  # sendUseBacklight
-    SET_SOUND = '3c'
-    SET_LOCK_BUTTONS = '3e'
-    GET_STATISTICS_WATT = '47'
-    GET_STARTS_COUNT = '50'
-    SET_TIME = '6e'  # sendSync
-    SET_IONIZATION = '1b'
-    SET_TEMPERATURE = '0b'
-    SET_TIME_COOKER = '0c'
+class RedmondCommand(IntEnum):
+    AUTH = 0xff
+    VERSION = 0x01
+    RUN_CURRENT_MODE = 0x03  # sendOn
+    STOP_CURRENT_MODE = 0x04  # sendOff
+    SET_STATUS_MODE = 0x05  # sendMode
+    GET_STATUS_MODE = 0x06
+    SET_DELAY = 0x08
+    AFTER_SPEED = 0x09  # sendAfterSpeed
+    SET_COLOR = 0x32  # sendSetLights
+    GET_COLOR = 0x33  # sendGetLights
+    SET_BACKLIGHT_MODE = 0x37  # sendUseBacklight
+    SET_SOUND = 0x3c
+    SET_LOCK_BUTTONS = 0x3e
+    GET_STATISTICS_WATT = 0x47
+    GET_STARTS_COUNT = 0x50
+    SET_TIME = 0x6e  # sendSync
+    SET_IONIZATION = 0x1b
+    SET_TEMPERATURE = 0x0b
+    SET_TIME_COOKER = 0x0c
 
     def __str__(self):
-        return str(self.value)
+        return '%02x' % self.value
 
 
 class RedmondKettle:
-    def __init__(self, hass, addr, key, backlight):
+    def __init__(
+        self,
+        hass,
+        addr,
+        key,
+        backlight,
+        connectionMode=CONNECTION_IDLE,
+        idleTimeout=DEFAULT_IDLE_TIMEOUT,
+        scheduler=None,
+        statsInterval=DEFAULT_STATS_INTERVAL,
+        syncInterval=DEFAULT_SYNC_INTERVAL,
+        optimistic=False,
+        slots=0
+    ):
         self.hass = hass
         self._type = None
+        self._profile = getProfile(None)
         self._name = None
         self._mac = addr
         self._key = key
+        self._keyBytes = bytes.fromhex(key)
         self._use_backlight = backlight
-        self._tgtemp = CONF_MIN_TEMP
-        self._temp = 0
-        self._Watts = 0
-        self._alltime = 0
-        self._times = 0
         self._firmware_ver = None
-        self._time_upd = '00:00'
         self._boiltime = '80'
-        self._nightlight_brightness = 255
-        self._rgb1 = (0, 0, 255)
         self._rgb2 = (255, 0, 0)
-        self._mode = MODE_BOIL  # '00' - boil, '01' - heat to temp, '03' - backlight | for cooker 00 - heat after cook, 01 - off after cook | for fan 00-06 - speed
-        self._status = '00'  # may be '00' - OFF or '02' - ON | for cooker 00 - off   01 - setup program   02 - on  04 - heat   05 - delayed start
-        self._prog = '00'  # program
-        self._sprog = '00'  # subprogram
-        self._ph = 0  # program hours
-        self._pm = 0  # program min
-        self._th = 0  # timer hours
-        self._tm = 0  # timer min
-        self._ion = '00'  # 00 - off   01 - on
-        self._conf_sound_on = False
+        self._sentLights = None
+        self.state = DeviceState(
+            seq=0,
+            available=False,
+            time_upd='00:00',
+            status=STATUS_OFF,
+            mode=MODE_BOIL,
+            temp=0,
+            tgtemp=CONF_MIN_TEMP,
+            ion=0,
+            conf_sound_on=False,
+            prog=0,
+            sprog=0,
+            ph=0,
+            pm=0,
+            th=0,
+            tm=0,
+            rgb1=(0, 0, 255),
+            nightlight_brightness=255,
+            Watts=0,
+            alltime=0,
+            times=0,
+            power=None,
+            cycle_energy=None,
+            ready_at=None,
+            cook_remaining=None,
+            cook_finish=None,
+            cook_progress=None
+        )
         self._auth = False
-        self._conn = BTLEConnection(self.hass, self._mac, self._key)
-        self._available = False
+        self._conn = BTLEConnection(self.hass, self._mac, self._key, connectionMode, idleTimeout, scheduler, slots)
+        self._commands = CommandQueue(self.hass)
+        self._poller = None
+        self._statLane = PollLane(statsInterval)
+        self._syncLane = PollLane(syncInterval)
+        self._published = None
+        self._reported = None
+        self._setupSince = None
+        self._optimistic = optimistic
+        self._expected = None
+        self._confirmed = None
+        self._unsubConfirm = None
+        self._history = None
+        self._heating = HeatingEstimator()
+        self._progress = CookerProgress()
+        self._unsubProgress = None
         self.initCallbacks()
 
     async def setNameAndType(self):
         await self._conn.setNameAndType()
         self._type = self._conn._type
+        self._profile = getProfile(self._type)
         self._name = self._conn._name
-        self._available = self._conn._available
+        self.setState(available=self._conn._available)
+
+    def setHistory(self, history):
+        self._history = history
+        self.setState(cycle_energy=history.cycleEnergy)
 
     def initCallbacks(self):
         self._conn.setConnectAfter(self.sendAuth)
+        self._conn.setPresentCallback(self.handlePresent)
         self._conn.setCallback(RedmondCommand.AUTH, self.responseAuth)
         self._conn.setCallback(RedmondCommand.VERSION, self.responseGetVersion)
         self._conn.setCallback(RedmondCommand.GET_STATUS_MODE, self.responseStatus)
         self._conn.setCallback(RedmondCommand.GET_STATISTICS_WATT, self.responseStat)
         self._conn.setCallback(RedmondCommand.GET_STARTS_COUNT, self.responseStat)
-
-    def hexToRgb(self, hexa: str):
-        return tuple(int(hexa[i:i + 2], 16) for i in (0, 2, 4))
-
-    def rgbToHex(self, rgb):
-        return '%02x%02x%02x' % rgb
-
-    @staticmethod
-    def hexToDec(hexChr: str) -> int:
-        return BTLEConnection.hexToDec(hexChr)
-
-    @staticmethod
-    def decToHex(num: int) -> str:
-        return BTLEConnection.decToHex(num)
-
-    def getHexNextIter(self) -> str:
-        return self._conn.getHexNextIter()
+        self._conn.acceptPush(RedmondCommand.GET_STATUS_MODE)
 
     async def sendAuth(self, conn):
         self._type = conn._type
+        self._profile = getProfile(self._type)
         self._name = conn._name
 
-        await conn.sendRequest(RedmondCommand.AUTH, self._key)
-        await asyncio.sleep(1.5)
-
-        if self._auth is False:
+        if not await conn.sendRequest(RedmondCommand.AUTH, self._keyBytes) or self._auth is False:
             raise Exception('error auth')
 
         return True
 
-    def responseAuth(self, arrayHex):
-        if self._type in [0, 1, 3, 4, 5] and arrayHex[3] == '01':
-            self._auth = True
-        elif self._type == 2 and arrayHex[3] == '02':
-            self._auth = True
-        else:
-            self._auth = False
+    def responseAuth(self, frame):
+        self._auth = self._profile.authReply is not None and frame.payload[0] == self._profile.authReply
 
         return self._auth
 
     async def sendGetVersion(self, conn):
         return await conn.sendRequest(RedmondCommand.VERSION)
 
-    def responseGetVersion(self, arrHex):
-        self._firmware_ver = str(self.hexToDec(arrHex[3])) + '.' + str(self.hexToDec(arrHex[4]))
+    def responseGetVersion(self, frame):
+        self._firmware_ver = codec.decodeVersion(frame.payload)
 
     async def sendOn(self, conn):
-        if self._type == 0:
+        if not self._profile.has(CAP_RUN):
             return True
 
-        if self._type in [1, 2, 3, 4, 5]:
-            return await conn.sendRequest(RedmondCommand.RUN_CURRENT_MODE)
-
-        return False
+        return await conn.sendRequest(RedmondCommand.RUN_CURRENT_MODE)
 
     async def sendOff(self, conn):
         return await conn.sendRequest(RedmondCommand.STOP_CURRENT_MODE)
 
     async def sendSyncDateTime(self, conn):
-        if self._type in [0, 3, 4, 5]:
+        if not self._profile.has(CAP_CLOCK):
             return True
 
-        if self._type in [1, 2]:
-            now = self.decToHex(int(time.time()))
-            offset = self.decToHex(time.timezone * -1)
-
-            return await conn.sendRequest(RedmondCommand.SET_TIME, now + offset + '0000')
-
-        return False
+        return await conn.sendPacked(RedmondCommand.SET_TIME, codec.SYNC_TIME, int(time.time()), time.timezone * -1)
 
     async def sendStat(self, conn):
-        if await conn.sendRequest(RedmondCommand.GET_STATISTICS_WATT, '00'):
-            if await conn.sendRequest(RedmondCommand.GET_STARTS_COUNT, '00'):
+        if await conn.sendRequest(RedmondCommand.GET_STATISTICS_WATT, b'\x00'):
+            if await conn.sendRequest(RedmondCommand.GET_STARTS_COUNT, b'\x00'):
                 return True
         return False
 
-    def responseStat(self, arrHex):
-        if arrHex[2] == '47':  # state watt
-            self._Watts = self.hexToDec(str(arrHex[9] + arrHex[10] + arrHex[11]))  # in Watts
-            self._alltime = round(self._Watts / 2200, 1)  # in hours
-        elif arrHex[2] == '50':  # state time
-            self._times = self.hexToDec(str(arrHex[6] + arrHex[7]))
+    def responseStat(self, frame):
+        if frame.cmd == RedmondCommand.GET_STATISTICS_WATT:
+            watts = codec.decodeStatWatts(frame.payload)  # in Watts
+            self.setState(Watts=watts, alltime=round(watts / 2200, 1))  # alltime in hours
+        elif frame.cmd == RedmondCommand.GET_STARTS_COUNT:
+            self.setState(times=codec.decodeStatStarts(frame.payload))
 
     async def sendStatus(self, conn):
         if await conn.sendRequest(RedmondCommand.GET_STATUS_MODE):
@@ -271,55 +507,130 @@ class RedmondKettle:
 
         return False
 
-    def responseStatus(self, arrHex):
-        if self._type == 0:
-            self._temp = self.hexToDec(arrHex[13])
-            self._status = arrHex[11]
-            self._mode = arrHex[3]
-
-            if arrHex[5] != '00':
-                self._tgtemp = self.hexToDec(arrHex[5])
-
-        elif self._type in [1, 2]:
-            self._temp = self.hexToDec(arrHex[8])
-            self._status = arrHex[11]
-            self._mode = arrHex[3]
-
-            if arrHex[5] != '00':
-                self._tgtemp = self.hexToDec(arrHex[5])
-
-            self._conf_sound_on = self.hexToDec(arrHex[7]) == 1
-
-        elif self._type == 3:
-            self._status = arrHex[11]
-            self._mode = arrHex[5]
-            self._ion = arrHex[14]
-        elif self._type == 4:
-            self._status = arrHex[11]
-            self._mode = arrHex[3]
-        elif self._type == 5:
-            self._prog = arrHex[3]
-            self._sprog = arrHex[4]
-            self._temp = self.hexToDec(arrHex[5])
-
-            if arrHex[5] != '00':
-                self._tgtemp = self.hexToDec(arrHex[5])
-
-            self._ph = self.hexToDec(arrHex[6])
-            self._pm = self.hexToDec(arrHex[7])
-            self._th = self.hexToDec(arrHex[8])
-            self._tm = self.hexToDec(arrHex[9])
-            self._mode = arrHex[10]
-            self._status = arrHex[11]
-
-        self._time_upd = time.strftime("%H:%M")
-        async_dispatcher_send(self.hass, SIGNAL_UPDATE_DATA)
+    @property
+    def reported(self) -> DeviceState:
+        # last state read from the device, commands are planned against it and not against local edits
+        return self._reported if self._reported is not None else self.state
+
+    def setState(self, **fields):
+        self.state = self.state._replace(seq=self.state.seq + 1, **fields)
+
+    def responseStatus(self, frame):
+        status = self._profile.decodeStatus(frame.payload)
+        previousStatus = self.state.status
+        previousTemp = self.state.temp
+
+        self.setState(time_upd=time.strftime("%H:%M"), available=True, **self._profile.statusFields(status))
+        self._reported = self.state
+
+        if previousStatus == STATUS_ON and self.state.status != STATUS_ON:
+            self._statLane.trigger()
+
+        if self.state.status != COOKER_STATUS_PROGRAM or not self._profile.has(CAP_COOKER):
+            self._setupSince = None
+        elif self._setupSince is None:
+            self._setupSince = time.monotonic()
+
+        self.trackHeating(previousTemp)
+        self.trackProgress()
+
+        if self._expected is not None:
+            rejected = [field for field, value in self._expected.items() if getattr(self.state, field) != value]
+
+            if rejected:
+                _LOGGER.debug('Device %s did not confirm %s, optimistic state rolled back', self._mac, rejected)
+
+            self._expected = None
+            self._confirmed = None
+
+        self.publish()
+
+        if self._poller is not None:
+            self._poller.stateChanged()
+
+    def heatingTarget(self, previousTemp):
+        state = self.state
+
+        if not self._profile.has(CAP_KETTLE) or state.status != STATUS_ON:
+            return None
+
+        if state.mode == MODE_BOIL:
+            return BOIL_TEMP
+
+        # the hold phase drifts around the target, only a reheat well below it that keeps rising is heating
+        if state.mode == MODE_KEEP_WARM and state.temp < state.tgtemp and state.temp >= previousTemp:
+            if self._heating.tracking or state.temp < state.tgtemp - KEEP_WARM_HYSTERESIS:
+                return state.tgtemp
+
+        return None
+
+    def trackHeating(self, previousTemp):
+        target = self.heatingTarget(previousTemp)
+
+        if target is None:
+            self._heating.reset()
+            self.setState(ready_at=None)
+            return
+
+        now = self.hass.loop.time()
+        self._heating.add(now, self.state.temp, target)
+        remaining = self._heating.remaining(now)
+
+        # a wall clock time stays right between the polls, a countdown would not
+        self.setState(
+            ready_at=None if remaining is None else datetime.fromtimestamp(round(time.time() + remaining), timezone.utc)
+        )
+
+    def trackProgress(self):
+        if self._profile.has(CAP_COOKER) and self.state.status == STATUS_ON:
+            self._progress.sync(
+                self.hass.loop.time(),
+                time.time(),
+                self.state.ph * 60 + self.state.pm,
+                self.state.th * 60 + self.state.tm
+            )
+
+            # the countdown moves on locally, every poll only resyncs it
+            if self._unsubProgress is None:
+                self._unsubProgress = async_track_time_interval(self.hass, self.tickProgress, PROGRESS_INTERVAL)
+        else:
+            self._progress.reset()
+            self.stopProgress()
+
+        self.setProgress()
+
+    def setProgress(self):
+        now = self.hass.loop.time()
+        remaining = self._progress.remaining(now)
+        finishAt = self._progress.finishAt
+
+        self.setState(
+            cook_remaining=None if remaining is None else math.ceil(remaining / 60),
+            cook_finish=None if finishAt is None else datetime.fromtimestamp(finishAt, timezone.utc),
+            cook_progress=self._progress.percent(now)
+        )
+
+    async def tickProgress(self, now):
+        self.setProgress()
+        self.publish()
+
+    def stopProgress(self):
+        if self._unsubProgress is not None:
+            self._unsubProgress()
+            self._unsubProgress = None
+
+    def predictedPoll(self):
+        if self._profile.has(CAP_COOKER):
+            return self._progress.finish
+
+        return self._heating.eta
 
     async def sendConfEnableSound(self, conn, on: bool):
-        if await conn.sendRequest(RedmondCommand.SET_SOUND, self.decToHex(int(on))):
+        if await conn.sendPacked(RedmondCommand.SET_SOUND, codec.BYTE, int(on)):
             return True
         return False
 
+    @queued(COMMAND_SOUND, capability=CAP_SOUND)
     async def setConfEnableSound(self, on: bool):
         try:
             async with self._conn as conn:
@@ -330,208 +641,427 @@ class RedmondKettle:
 
         return False
 
-    # 00 - boil
-    # 01 - heat
-    # 03 - backlight (boil by default)
-    # temp - temp or rgb in HEX
-    async def sendMode(self, conn, mode: str, temp: str = '00'):
-        if self._type in [3, 4, 5]:
+    # 0 - boil
+    # 1 - heat
+    # 3 - backlight (boil by default)
+    async def sendMode(self, conn, mode: int, temp: int = 0):
+        if self._profile.modeLayout is None:
             return True
 
-        if self._type == 0:
-            str2b = mode + '00' + temp + '00'
-        elif self._type in [1, 2]:
-            str2b = mode + '00' + temp + '00000000000000000000800000'
-        else:
-            return True
-
-        return await conn.sendRequest(RedmondCommand.SET_STATUS_MODE, str2b)
+        return await conn.sendPacked(
+            RedmondCommand.SET_STATUS_MODE,
+            self._profile.modeLayout,
+            mode,
+            temp,
+            *self._profile.modeExtra
+        )
 
     async def sendModeCook(self, conn, prog, sprog, temp, hours, minutes, dhours, dminutes, heat):
-        if self._type == 5:
-            str2b = prog + sprog + temp + hours + minutes + dhours + dminutes + heat
-            return await conn.sendRequest(RedmondCommand.SET_STATUS_MODE, str2b)
-        else:
+        if not self._profile.has(CAP_COOKER):
             return True
 
+        return await conn.sendPacked(
+            RedmondCommand.SET_STATUS_MODE,
+            codec.MODE_COOKER,
+            prog, sprog, temp, hours, minutes, dhours, dminutes, heat
+        )
+
     async def sendTimerCook(self, conn, hours, minutes):
-        if self._type == 5:
-            return await conn.sendRequest(RedmondCommand.SET_TIME_COOKER, hours + minutes)
-        else:
+        if not self._profile.has(CAP_COOKER):
             return True
 
-    async def sendTemperature(self, conn, temp: str):  # temp in HEX or speed 00-06
-        if self._type in [1, 2, 3, 5]:
-            return await conn.sendRequest(RedmondCommand.SET_TEMPERATURE, temp)
-        else:
+        return await conn.sendPacked(RedmondCommand.SET_TIME_COOKER, codec.TIMER_COOKER, hours, minutes)
+
+    async def sendTemperature(self, conn, temp: int):  # temp or speed 0-6
+        if not self._profile.has(CAP_TEMPERATURE):
             return True
 
-    async def sendIonCmd(self, conn, onoff):  # 00-off 01-on
-        if self._type == 3:
-            return await conn.sendRequest(RedmondCommand.SET_IONIZATION, onoff)
+        return await conn.sendPacked(RedmondCommand.SET_TEMPERATURE, codec.BYTE, temp)
 
-        return True
+    async def sendIonCmd(self, conn, onoff: int):  # 0-off 1-on
+        if not self._profile.has(CAP_ION):
+            return True
+
+        return await conn.sendPacked(RedmondCommand.SET_IONIZATION, codec.BYTE, onoff)
 
     async def sendAfterSpeed(self, conn):
-        if self._type == 3:
-            return await conn.makeRequest('55' + self.getHexNextIter() + '0900aa', True)
+        if not self._profile.has(CAP_FAN):
+            return True
 
-        return True
+        return await conn.sendRequest(RedmondCommand.AFTER_SPEED, b'\x00')
 
     async def sendUseBackLight(self, conn):
-        if self._type in [0, 3, 4, 5]:
+        if not self._profile.has(CAP_BACKLIGHT):
             return True
 
-        onoff = "00"
-        if self._type in [1, 2]:
-            if self._use_backlight:
-                onoff = "01"
+        return await conn.sendPacked(
+            RedmondCommand.SET_BACKLIGHT_MODE,
+            codec.BACKLIGHT,
+            0xc8, 0xc8, int(bool(self._use_backlight))
+        )
 
-            return await conn.sendRequest(RedmondCommand.SET_BACKLIGHT_MODE, 'c8c8' + onoff)
+    async def sendSetLights(self, conn, boilOrLight=1, rgb1=(0, 0, 255)):  # 0 - boil light  1 - backlight
+        if not self._profile.has(CAP_NIGHTLIGHT):
+            return True
 
-        return False
+        scale_light = (0x28, 0x46, 0x64) if boilOrLight == 0 else (0x00, 0x32, 0x64)
+        bright = self.state.nightlight_brightness
+        lights = (boilOrLight, tuple(rgb1), bright, self._rgb2)
 
-    async def sendSetLights(self, conn, boilOrLight='01', rgb1='0000ff'):  # 00 - boil light  01 - backlight
-        if self._type in [0, 3, 4, 5]:
+        if lights == self._sentLights:
             return True
 
-        if self._type in [1, 2]:
-            scale_light = ['28', '46', '64'] if boilOrLight == "00" else ['00', '32', '64'];
-            bright = self.decToHex(self._nightlight_brightness)
-            rgb2 = self.rgbToHex(self._rgb2)
-
-            return await conn.sendRequest(
-                RedmondCommand.SET_COLOR,
-                boilOrLight
-                + scale_light[0] + bright + rgb1
-                + scale_light[1] + bright + rgb1
-                + scale_light[2] + bright + rgb2
-            )
+        self._sentLights = None
 
-        return False
+        if not await conn.sendPacked(
+            RedmondCommand.SET_COLOR,
+            codec.COLOR,
+            boilOrLight,
+            scale_light[0], bright, *rgb1,
+            scale_light[1], bright, *rgb1,
+            scale_light[2], bright, *self._rgb2
+        ):
+            return False
+
+        self._sentLights = lights
+
+        return True
+
+    def planMode(self, mode, temp=0, lights=None) -> list:
+        state = self.reported
+        sameMode = state.mode == mode and temp in [0, state.tgtemp]
+        changeLights = self._profile.has(CAP_NIGHTLIGHT) and lights is not None and \
+            self._sentLights != (1, tuple(lights), self.state.nightlight_brightness, self._rgb2)
+
+        if state.status == STATUS_ON and sameMode:
+            return [STEP_LIGHTS, STEP_RUN] if changeLights else []
+
+        steps = [STEP_STOP] if state.status != STATUS_OFF else []
+
+        if changeLights:
+            steps.append(STEP_LIGHTS)
+
+        # kettles without RUN_CURRENT_MODE start on the mode frame itself
+        if self._profile.modeLayout is not None and (not sameMode or not self._profile.has(CAP_RUN)):
+            steps.append(STEP_MODE)
 
+        if self._profile.has(CAP_RUN):
+            steps.append(STEP_RUN)
+
+        return steps
+
+    async def runPlan(self, conn, steps, mode, temp=0, lights=None):
+        _LOGGER.debug('Plan for %s: %s', self._mac, steps)
+
+        for step in steps:
+            if step == STEP_STOP:
+                await self.sendOff(conn)
+            elif step == STEP_LIGHTS and not await self.sendSetLights(conn, 1, lights):
+                return False
+            elif step == STEP_MODE and not await self.sendMode(conn, mode, temp):
+                return False
+            elif step == STEP_RUN and not await self.sendOn(conn):
+                return False
+
+        return True
+
+    @queued(COMMAND_MODE, refreshes=True, capability=CAP_NIGHTLIGHT)
     async def startNightColor(self):
         try:
             async with self._conn as conn:
-                if self._status == STATUS_ON and self._mode != MODE_LIGHT:
-                    await self.sendOff(conn)
+                steps = self.planMode(MODE_LIGHT, lights=self.state.rgb1)
 
-                if await self.sendSetLights(conn, '01', self.rgbToHex(self._rgb1)):
-                    if await self.sendMode(conn, MODE_LIGHT):
-                        if await self.sendOn(conn):
-                            if await self.sendStatus(conn):
-                                return True
+                if await self.runPlan(conn, steps, MODE_LIGHT, lights=self.state.rgb1):
+                    if await self.confirm(conn, status=STATUS_ON, mode=MODE_LIGHT):
+                        return True
         except:
             pass
 
         return False
 
+    @queued(COMMAND_MODE, refreshes=True)
     async def modeOn(self, mode=MODE_BOIL, temp: int = 0):
         try:
             async with self._conn as conn:
-                if self._status != STATUS_OFF:
-                    await self.sendOff(conn)
-
-                if await self.sendMode(conn, mode, self.decToHex(temp)):
-                    if await self.sendOn(conn) and await self.sendStatus(conn):
+                if await self.runPlan(conn, self.planMode(mode, temp), mode, temp):
+                    if await self.confirm(conn, status=STATUS_ON, mode=mode):
                         return True
         except:
             pass
 
         return False
 
-    async def modeOnCook(self, prog, sprog, temp, hours, minutes, dhours='00', dminutes='00', heat='01'):
+    @queued(COMMAND_MODE, refreshes=True, capability=CAP_COOKER)
+    async def modeOnCook(self, prog, sprog, temp, hours, minutes, dhours=0, dminutes=0, heat=1):
         try:
             async with self._conn as conn:
-                if self._status != STATUS_OFF:
+                if self.state.status != STATUS_OFF:
                     await self.sendOff(conn)
 
                 if await self.sendModeCook(conn, prog, sprog, temp, hours, minutes, dhours, dminutes, heat):
                     if await self.sendOn(conn):
-                        if await self.sendStatus(conn):
+                        if await self.confirm(
+                            conn,
+                            status=COOKER_STATUS_DELAYED_START if dhours or dminutes else STATUS_ON,
+                            prog=prog,
+                            sprog=sprog,
+                            tgtemp=temp,
+                            ph=hours,
+                            pm=minutes,
+                            mode=heat
+                        ):
                             return True
         except:
             pass
 
         return False
 
+    @queued(COMMAND_TEMPERATURE, refreshes=True, capability=CAP_COOKER)
     async def modeTempCook(self, temp):
         try:
             async with self._conn as conn:
-                if await self.sendTemperature(conn, temp) and await self.sendStatus(conn):
-                    return True
+                if self.reported.tgtemp == temp or await self.sendTemperature(conn, temp):
+                    if await self.confirm(conn, tgtemp=temp):
+                        return True
         except:
             pass
 
         return False
 
+    @queued(COMMAND_MODE, refreshes=True, capability=CAP_FAN)
     async def modeFan(self, speed):
         try:
             async with self._conn as conn:
-                if await self.sendTemperature(conn, speed):
-                    if await self.sendAfterSpeed(conn):
-                        if self._status == STATUS_OFF:
-                            await self.sendOn(conn)
-                        if await self.sendStatus(conn):
-                            return True
+                if self.reported.mode != speed:
+                    if not await self.sendTemperature(conn, speed) or not await self.sendAfterSpeed(conn):
+                        return False
+
+                if self.reported.status == STATUS_OFF:
+                    await self.sendOn(conn)
+
+                if await self.confirm(conn, status=STATUS_ON, mode=speed):
+                    return True
         except:
             pass
 
         return False
 
+    @queued(COMMAND_ION, refreshes=True, capability=CAP_ION)
     async def modeIon(self, onoff):
         try:
             async with self._conn as conn:
-                if await self.sendIonCmd(conn, onoff):
-                    if await self.sendStatus(conn):
+                if self.reported.ion == onoff or await self.sendIonCmd(conn, onoff):
+                    if await self.confirm(conn, ion=onoff):
                         return True
         except:
             pass
 
         return False
 
+    @queued(COMMAND_TIMER, refreshes=True, capability=CAP_COOKER)
     async def modeTimeCook(self, hours, minutes):
         try:
             async with self._conn as conn:
-                if await self.sendTimerCook(conn, hours, minutes) and await self.sendStatus(conn):
+                if await self.sendTimerCook(conn, hours, minutes) and await self.confirm(conn, ph=hours, pm=minutes):
                     return True
         except:
             pass
 
         return False
 
+    @queued(COMMAND_MODE, refreshes=True)
     async def modeOff(self):
         try:
             async with self._conn as conn:
-                if await self.sendOff(conn):
-                    if await self.sendStatus(conn):
+                if self.reported.status == STATUS_OFF or await self.sendOff(conn):
+                    if await self.confirm(conn, status=STATUS_OFF):
                         return True
         except:
             pass
 
         return False
 
+    @queued(COMMAND_TEMPERATURE)
     async def setTemperatureHeat(self, temp: int = CONF_MIN_TEMP):
         temp = CONF_MIN_TEMP if temp < CONF_MIN_TEMP else temp
         temp = CONF_MAX_TEMP if temp > CONF_MAX_TEMP else temp
-        self._tgtemp = temp
+        self.setState(tgtemp=temp)
 
         try:
             async with self._conn as conn:
-                if await self.sendTemperature(conn, self.decToHex(temp)):
+                if await self.sendTemperature(conn, temp):
                     return True
         except:
             pass
 
         return False
 
+    def startTracking(self):
+        self._conn.startTracking()
+
+    def stopTracking(self):
+        self._conn.stopTracking()
+
+    def startPolling(self, interval, phases=None):
+        self._poller = PollScheduler(self.hass, self, interval, phases)
+        self._poller.start()
+
+    def stopPolling(self):
+        if self._poller is not None:
+            self._poller.stop()
+            self._poller = None
+
+        if self._unsubConfirm is not None:
+            self._unsubConfirm()
+            self._unsubConfirm = None
+
+        self.stopProgress()
+
+    async def confirm(self, conn, **expected):
+        if not self._optimistic:
+            return await self.sendStatus(conn)
+
+        if self._expected is None:
+            self._confirmed = self.state
+            self._expected = {}
+
+        self._expected.update(expected)
+        self.setState(**expected)
+        self.publish()
+
+        if self._poller is not None:
+            self._poller.stateChanged()
+
+        # commands in a row share one confirming read
+        if self._unsubConfirm is not None:
+            self._unsubConfirm()
+
+        self._unsubConfirm = async_call_later(self.hass, CONFIRM_DELAY, self.confirmStatus)
+
+        return True
+
+    async def confirmStatus(self, now):
+        self._unsubConfirm = None
+
+        if not await self.update(now) and self._expected is not None:
+            _LOGGER.debug('Status of %s not read, optimistic state rolled back', self._mac)
+            self.setState(**{field: getattr(self._confirmed, field) for field in self._expected})
+            self._expected = None
+            self._confirmed = None
+            self.publish()
+
+    @property
+    def skippedPolls(self) -> int:
+        return self._poller.skipped if self._poller is not None else 0
+
+    @property
+    def updateSignal(self) -> str:
+        return f'{SIGNAL_UPDATE_DATA}[{self._mac}]'
+
+    def publish(self):
+        state = self.state
+        published = self._published
+
+        if published is not None and published.seq == state.seq:
+            return
+
+        self._published = state
+        changed = frozenset(
+            field for field in STATE_FIELDS if published is None or getattr(published, field) != getattr(state, field)
+        )
+
+        if changed:
+            async_dispatcher_send(self.hass, self.updateSignal, changed)
+
+    def getPollInterval(self, interval):
+        idle = min(interval * POLL_IDLE_FACTOR, POLL_IDLE_MAX)
+
+        # the device reports its status by itself, the poll is only a probe of the open link
+        lastPush = self._conn.lastPush
+        if self._conn.isPush and lastPush is not None and time.monotonic() - lastPush < idle:
+            return idle
+
+        # a running program counts down locally and is read once more at its predicted end, see predictedPoll
+        if self._profile.has(CAP_COOKER):
+            if self.state.status == COOKER_STATUS_PROGRAM:
+                if self._setupSince is not None and time.monotonic() - self._setupSince < POLL_SETUP_PERIOD:
+                    return POLL_FAST_INTERVAL
+                return interval
+            if self.state.status in [STATUS_ON, COOKER_STATUS_KEEP_WARM, COOKER_STATUS_DELAYED_START]:
+                return interval
+            return idle
+
+        if self.state.status != STATUS_ON:
+            return idle
+
+        # once the heating rate is known the poll waits for the predicted end, see predictedPoll.
+        # a boil is polled fast until then, a keep warm reheat is not worth it
+        if self._heating.tracking and self._heating.eta is None and self.state.mode == MODE_BOIL:
+            return POLL_FAST_INTERVAL
+
+        return interval
+
+    def handlePresent(self):
+        self.hass.async_create_task(self.update(None))
+
+    async def pollSyncDateTime(self, conn):
+        now = time.monotonic()
+
+        if not self._syncLane.isDue(now):
+            return True
+
+        if await self.sendSyncDateTime(conn):
+            self._syncLane.done(now)
+            return True
+
+        return False
+
+    async def pollStat(self, conn):
+        now = time.monotonic()
+
+        if not self._statLane.isDue(now):
+            return True
+
+        if await self.sendStat(conn):
+            self._statLane.done(now)
+            self.recordEnergy()
+            return True
+
+        return False
+
+    def recordEnergy(self):
+        if self._history is None:
+            return
+
+        self._history.add(time.time(), self.state.Watts, self.state.times)
+        self.setState(power=self._history.power, cycle_energy=self._history.cycleEnergy)
+        self.publish()
+        self.hass.async_create_task(self._history.async_flush(self.hass))
+
+    @queued(COMMAND_POLL)
     async def update(self, now, **kwargs) -> bool:
+        if not self._conn.isPresent:
+            _LOGGER.debug('Device %s is not advertising, skip update', self._mac)
+
+            if self.state.available:
+                self.setState(available=False)
+                self.publish()
+
+            return False
+
         try:
             async with self._conn as conn:
-                if await self.sendSyncDateTime(conn) and await self.sendStatus(conn) and await self.sendStat(conn):
+                if await self.pollSyncDateTime(conn) and await self.sendStatus(conn) and await self.pollStat(conn):
                     return True
-        except:
-            pass
+        except CircuitOpenError as ex:
+            _LOGGER.debug(str(ex))
+        except Exception as ex:
+            _LOGGER.warning('Update %s failed: %s', self._mac, ex)
+
+        if self._conn.isSuspended and self.state.available:
+            _LOGGER.warning('Device %s marked unavailable after repeated connection failures', self._mac)
+            self.setState(available=False)
+            self.publish()
 
         return False
 
@@ -544,6 +1074,6 @@ class RedmondKettle:
                     if await self.update(1):
                         return True
 
-        self._available = False
+        self.setState(available=False)
 
         return False
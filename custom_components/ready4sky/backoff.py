@@ -0,0 +1,57 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+import random
+import time
+
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 300.0
+FAILURE_THRESHOLD = 5
+PROBE_INTERVAL = 600.0
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def backoffDelay(attempt: int, base=BACKOFF_BASE, maximum=BACKOFF_MAX) -> float:
+    delay = min(maximum, base * 2 ** attempt)
+
+    # equal jitter, keeps at least half of the delay
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class FailureTracker:
+    def __init__(self, threshold=FAILURE_THRESHOLD, probeInterval=PROBE_INTERVAL):
+        self._threshold = threshold
+        self._probeInterval = probeInterval
+        self._failures = 0
+        self._nextAttempt = 0.0
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    @property
+    def isOpen(self) -> bool:
+        return self._failures >= self._threshold
+
+    def allowAttempt(self) -> bool:
+        return time.monotonic() >= self._nextAttempt
+
+    def recordFailure(self):
+        self._failures += 1
+
+        if self.isOpen:
+            delay = self._probeInterval / 2 + random.uniform(0, self._probeInterval / 2)
+        else:
+            delay = backoffDelay(self._failures)
+
+        self._nextAttempt = time.monotonic() + delay
+
+    def recordSuccess(self):
+        self.reset()
+
+    def reset(self):
+        self._failures = 0
+        self._nextAttempt = 0.0
@@ -2,24 +2,52 @@
 # coding: utf-8
 
 import asyncio
-import binascii
 import inspect
 import logging
-from textwrap import wrap
+import time
 
-from bleak import (BleakClient, BleakError)
+from bleak import BleakError
+from bleak_retry_connector import (BleakClientWithServiceCache, establish_connection)
 from homeassistant.components import bluetooth
 
-from .r4sconst import SUPPORTED_DEVICES
+from .backoff import (CircuitOpenError, FailureTracker, backoffDelay)
+from .codec import (FrameBuilder, decodeFrame)
+from .profiles import getModelProfile
+from .scheduler import (PRIORITY_COMMAND, PRIORITY_POLL, SOURCE_DEFAULT)
+from .tracing import (DIRECTION_IN, DIRECTION_OUT)
 
 _LOGGER = logging.getLogger(__name__)
 
 UART_RX_CHAR_UUID = "6E400002-B5A3-F393-E0A9-E50E24DCCA9E"
 UART_TX_CHAR_UUID = "6E400003-B5A3-F393-E0A9-E50E24DCCA9E"
 
+REQUEST_TIMEOUT = 5.0
+CONNECT_ATTEMPTS = 3
+
+CONNECTION_ALWAYS = 'always'
+CONNECTION_IDLE = 'idle'
+CONNECTION_PER_OPERATION = 'per_operation'
+CONNECTION_PUSH = 'push'
+
+DEFAULT_IDLE_TIMEOUT = 30
+
+ADVERTISEMENT_TIMEOUT = 120
+
+# resolved GATT services by MAC, survives reconnects and entry reloads
+SERVICES_CACHE = {}
+
 
 class BTLEConnection:
-    def __init__(self, hass, mac, key, ):
+    def __init__(
+        self,
+        hass,
+        mac,
+        key,
+        mode=CONNECTION_IDLE,
+        idleTimeout=DEFAULT_IDLE_TIMEOUT,
+        scheduler=None,
+        slots=0
+    ):
         self._type = None
         self._name = ''
         self._hass = hass
@@ -27,20 +55,41 @@ class BTLEConnection:
         self._key = key
         self._iter = 0
         self._callbacks = {}
+        self._pending = {}
         self._afterConnectCallback = None
         self._conn = None
         self._device = None
         self._available = False
+        self._mode = mode
+        self._idleTimeout = idleTimeout
+        self._idleTimer = None
+        self._disconnectTask = None
+        self._users = 0
+        self._scheduler = scheduler
+        self._slots = slots  # 0 - as the bluetooth manager reports
+        self._slot = None
+        self.priority = PRIORITY_POLL
+        self._lastSeen = None
+        self._rssi = None
+        self._unsubAdvertisement = None
+        self._presentCallback = None
+        self._failures = FailureTracker()
+        self._clientFactory = None
+        self._tracer = None
+        self._pushCommands = set()
+        self._frames = FrameBuilder()
+        self._lastPush = None
 
     async def setNameAndType(self):
-        self._device = bluetooth.async_ble_device_from_address(self._hass, self._mac, False)
+        if self._clientFactory is None:
+            self._device = bluetooth.async_ble_device_from_address(self._hass, self._mac, False)
 
         if self._device is None:
             _LOGGER.debug('Device "%s" not found on bluetooth network', self._mac)
             return self
 
         self._name = self._device.name
-        self._type = SUPPORTED_DEVICES.get(self._name)
+        self._type = getModelProfile(self._name).type
 
         if self._type is None:
             self._available = False
@@ -52,41 +101,226 @@ class BTLEConnection:
         return self
 
     async def __aenter__(self):
+        self._users += 1
+        self.cancelIdleTimer()
+
+        try:
+            return await self.connect()
+        except BaseException:
+            self._users -= 1
+            raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._users -= 1
+
+        if self._users > 0:
+            return
+
+        if self._mode == CONNECTION_PER_OPERATION:
+            await self.disconnect()
+        elif self._mode == CONNECTION_IDLE:
+            self._idleTimer = self._hass.loop.call_later(self._idleTimeout, self.idleDisconnect)
+
+    async def connect(self):
+        if self._disconnectTask is not None:
+            await self._disconnectTask
+
         if self._type is None:
             await self.setNameAndType()
             if self._type is None:
                 return self
 
-        for i in range(3):
-            isConnected = self._conn is not None and self._conn.is_connected
+        if not self.isConnected and self.priority != PRIORITY_COMMAND and not self._failures.allowAttempt():
+            raise CircuitOpenError('Connect to %s postponed after %d failures' % (self._mac, self._failures.failures))
+
+        for i in range(CONNECT_ATTEMPTS):
+            isConnected = self.isConnected
 
             _LOGGER.debug('IS CONNECTED: %s', str(isConnected))
 
             if isConnected:
                 break
 
-            try:
-                self._conn = BleakClient(self._device or self._mac)
+            await self.acquireSlot()
 
-                await self._conn.connect()
-                await self._conn.start_notify(UART_TX_CHAR_UUID, self.handleNotification)
+            try:
+                await self.connectClient()
                 await self.connectAfter()
+                self._failures.recordSuccess()
                 break
-            except BaseException as ex:
+            except Exception as ex:
                 _LOGGER.error('Unable to connect')
                 _LOGGER.exception(ex)
 
-                if i < 2:
-                    await asyncio.sleep(1 + i)
+                if i < CONNECT_ATTEMPTS - 1:
+                    await asyncio.sleep(backoffDelay(i))
                 else:
+                    self._failures.recordFailure()
                     await self.disconnect()
                     raise ex
 
         return self
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._iter == 255:
-            await self.disconnect()
+    def setClientFactory(self, factory, device):
+        self._clientFactory = factory
+        self._device = device
+
+    async def connectClient(self):
+        if self._clientFactory is not None:
+            self._conn = self._clientFactory(self._device, disconnected_callback=self.handleDisconnect)
+            await self._conn.connect()
+            await self._conn.start_notify(UART_TX_CHAR_UUID, self.handleNotification)
+            return
+
+        cachedServices = SERVICES_CACHE.get(self._mac)
+
+        self._conn = await establish_connection(
+            BleakClientWithServiceCache,
+            self.refreshDevice(),
+            self._name or self._mac,
+            disconnected_callback=self.handleDisconnect,
+            max_attempts=1,
+            cached_services=cachedServices,
+            ble_device_callback=self.refreshDevice
+        )
+
+        try:
+            await self._conn.start_notify(UART_TX_CHAR_UUID, self.handleNotification)
+        except BleakError:
+            if cachedServices is not None:
+                _LOGGER.debug('Services cache of %s is stale, full discovery on next attempt', self._mac)
+                SERVICES_CACHE.pop(self._mac, None)
+                await self._conn.clear_cache()
+
+            await self._conn.disconnect()
+            raise
+
+        SERVICES_CACHE[self._mac] = self._conn.services
+
+    def refreshDevice(self):
+        if self._clientFactory is not None:
+            return self._device
+
+        device = bluetooth.async_ble_device_from_address(self._hass, self._mac, True)
+
+        if device is not None:
+            self._device = device
+
+        return self._device
+
+    def getSource(self):
+        if self._clientFactory is not None:
+            return SOURCE_DEFAULT
+
+        serviceInfo = bluetooth.async_last_service_info(self._hass, self._mac, True)
+
+        return serviceInfo.source if serviceInfo is not None else SOURCE_DEFAULT
+
+    async def acquireSlot(self):
+        if self._scheduler is None or self._slot is not None:
+            return
+
+        source = self.getSource()
+        slots = self.getSourceSlots(source)
+
+        if slots:
+            self._scheduler.setSlots(source, slots)
+
+        await self._scheduler.acquire(source, self.priority)
+        self._slot = source
+
+    def getSourceSlots(self, source):
+        if self._slots:
+            return self._slots
+
+        # newer Home Assistant versions report the connection slots of every adapter and proxy
+        allocations = getattr(bluetooth, 'async_current_allocations', None)
+
+        if self._clientFactory is not None or allocations is None:
+            return None
+
+        for allocation in allocations(self._hass, source) or []:
+            if allocation.source == source:
+                return allocation.slots
+
+        return None
+
+    def releaseSlot(self):
+        if self._slot is not None:
+            self._scheduler.release(self._slot)
+            self._slot = None
+
+    @property
+    def queueDepth(self) -> int:
+        if self._scheduler is None:
+            return 0
+
+        return self._scheduler.queueDepth(self._slot or self.getSource())
+
+    def handleDisconnect(self, client):
+        _LOGGER.debug('Disconnected from %s', self._mac)
+        self._lastPush = None
+        self.releaseSlot()
+
+    def startTracking(self):
+        self._unsubAdvertisement = bluetooth.async_register_callback(
+            self._hass,
+            self.handleAdvertisement,
+            bluetooth.BluetoothCallbackMatcher(address=self._mac, connectable=False),
+            bluetooth.BluetoothScanningMode.PASSIVE
+        )
+
+    def stopTracking(self):
+        if self._unsubAdvertisement is not None:
+            self._unsubAdvertisement()
+            self._unsubAdvertisement = None
+
+    def handleAdvertisement(self, serviceInfo, change):
+        wasPresent = self.isPresent
+
+        self._lastSeen = time.monotonic()
+        self._rssi = serviceInfo.rssi
+
+        if not wasPresent:
+            _LOGGER.debug('Device %s is advertising again', self._mac)
+            self._failures.reset()
+
+            if self._presentCallback is not None:
+                self._presentCallback()
+
+    @property
+    def isConnected(self) -> bool:
+        return self._conn is not None and self._conn.is_connected
+
+    @property
+    def isPresent(self) -> bool:
+        if self._lastSeen is None or self.isConnected:
+            return True
+
+        return time.monotonic() - self._lastSeen < ADVERTISEMENT_TIMEOUT
+
+    @property
+    def isSuspended(self) -> bool:
+        return self._failures.isOpen
+
+    @property
+    def rssi(self):
+        return self._rssi
+
+    def setPresentCallback(self, func):
+        self._presentCallback = func
+
+    def cancelIdleTimer(self):
+        if self._idleTimer is not None:
+            self._idleTimer.cancel()
+            self._idleTimer = None
+
+    def idleDisconnect(self):
+        self._idleTimer = None
+
+        if self._users == 0:
+            _LOGGER.debug('Idle timeout, disconnect %s', self._mac)
+            self._disconnectTask = self._hass.async_create_task(self.disconnect())
 
     @staticmethod
     async def getDiscoverDevices(hass):
@@ -95,38 +329,78 @@ class BTLEConnection:
         return {str(device.address): str(device.name) for device in devices}
 
     async def disconnect(self):
+        self.cancelIdleTimer()
+
         try:
-            await asyncio.sleep(2.0)
-            await self._conn.disconnect()
+            if self._conn is not None:
+                await self._conn.disconnect()
 
             self._iter = 0
         except BaseException as ex:
             self._available = False
             _LOGGER.error('disconnect failed')
             _LOGGER.exception(ex)
+        finally:
+            self.releaseSlot()
+            self._disconnectTask = None
 
     def handleNotification(self, handle, data):
-        arrData = wrap(binascii.b2a_hex(data).decode("utf-8"), 2)
-        respType = arrData[2]
+        if self._tracer is not None:
+            self._tracer.record(DIRECTION_IN, self._mac, data)
+
+        frame = decodeFrame(data)
+
+        _LOGGER.debug('NOTIF: handle: %s cmd: %s full: %s', handle, frame.cmd, data)
+
+        future = self._pending.pop((frame.iter, frame.cmd), None)
+
+        if future is None or future.done():
+            if self._mode == CONNECTION_PUSH and frame.cmd in self._pushCommands:
+                _LOGGER.debug('NOTIF: push iter: %s cmd: %s', frame.iter, frame.cmd)
+                self._lastPush = time.monotonic()
+                self.dispatch(frame)
+                return
+
+            _LOGGER.debug('NOTIF: drop stale response iter: %s cmd: %s', frame.iter, frame.cmd)
+            return
 
-        _LOGGER.debug('NOTIF: handle: %s cmd: %s full: %s', str(handle), str(respType), str(arrData))
+        self.dispatch(frame)
+        future.set_result(frame)
 
-        if respType in self._callbacks:
-            self._callbacks[respType](arrData)
+    def dispatch(self, frame):
+        if frame.cmd in self._callbacks:
+            self._callbacks[frame.cmd](frame)
+
+    def setTracer(self, tracer):
+        self._tracer = tracer
 
     @property
     def mac(self):
         return self._mac
 
     def setCallback(self, respType, function):
-        self._callbacks[str(respType)] = function
+        self._callbacks[int(respType)] = function
+
+    def acceptPush(self, respType):
+        self._pushCommands.add(int(respType))
+
+    @property
+    def isPush(self) -> bool:
+        return self._mode == CONNECTION_PUSH
+
+    @property
+    def lastPush(self):
+        return self._lastPush
 
     async def makeRequest(self, value):
-        cmd = wrap(value, 2)
-        _LOGGER.debug('MAKE REQUEST: cmd %s, full %s', cmd[2], cmd)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug('MAKE REQUEST: cmd %s, full %s', value[2], value.hex())
+
+        if self._tracer is not None:
+            self._tracer.record(DIRECTION_OUT, self._mac, value)
 
         try:
-            await self._conn.write_gatt_char(UART_RX_CHAR_UUID, binascii.a2b_hex(bytes(value, 'utf-8')), True)
+            await self._conn.write_gatt_char(UART_RX_CHAR_UUID, value, True)
 
             return True
         except BleakError as ex:
@@ -135,22 +409,38 @@ class BTLEConnection:
 
         return False
 
-    async def sendRequest(self, cmdHex, dataHex=''):
-        return await self.makeRequest('55' + self.getHexNextIter() + str(cmdHex) + dataHex + 'aa')
+    async def sendRequest(self, cmd, payload=b'', timeout=REQUEST_TIMEOUT):
+        iterNum = self.getNextIter()
 
-    @staticmethod
-    def hexToDec(hexStr: str) -> int:
-        return int.from_bytes(binascii.a2b_hex(bytes(hexStr, 'utf-8')), 'little')
+        return await self.request(iterNum, cmd, self._frames.fill(iterNum, cmd, payload), timeout)
 
-    @staticmethod
-    def decToHex(num: int) -> str:
-        return num.to_bytes((num.bit_length() + 7) // 8, 'little').hex() or '00'
+    async def sendPacked(self, cmd, layout, *values, timeout=REQUEST_TIMEOUT):
+        iterNum = self.getNextIter()
+
+        return await self.request(iterNum, cmd, self._frames.pack(iterNum, cmd, layout, *values), timeout)
+
+    async def request(self, iterNum, cmd, frame, timeout):
+        key = (iterNum, int(cmd))
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+
+        try:
+            if not await self.makeRequest(frame):
+                return False
+
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.error('Response timeout for cmd %s on %s', str(cmd), self._mac)
+        finally:
+            self._pending.pop(key, None)
+
+        return False
 
-    def getHexNextIter(self) -> str:
+    def getNextIter(self) -> int:
         current = self._iter
         self._iter = 0 if self._iter > 254 else self._iter + 1
 
-        return self.decToHex(current)
+        return current
 
     async def connectAfter(self):
         if self._afterConnectCallback is not None:
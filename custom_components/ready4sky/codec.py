@@ -0,0 +1,112 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+from collections import namedtuple
+from struct import Struct
+
+FRAME_START = 0x55
+FRAME_END = 0xaa
+
+HEADER = Struct('<BBB')  # start, iter, cmd
+
+Frame = namedtuple('Frame', ['iter', 'cmd', 'payload'])
+
+StatusKettle = namedtuple('StatusKettle', ['mode', 'tgtemp', 'status', 'temp'])
+StatusKettleSound = namedtuple('StatusKettleSound', ['mode', 'tgtemp', 'sound', 'temp', 'status'])
+StatusAirClean = namedtuple('StatusAirClean', ['mode', 'status', 'ion'])
+StatusSocket = namedtuple('StatusSocket', ['mode', 'status'])
+StatusCooker = namedtuple('StatusCooker', ['prog', 'sprog', 'tgtemp', 'ph', 'pm', 'th', 'tm', 'mode', 'status'])
+
+# payload layouts of GET_STATUS_MODE response by device type, offsets start after the cmd byte
+STATUS_LAYOUTS = {
+    0: (Struct('<BxB5xBxB'), StatusKettle),
+    1: (Struct('<BxBxBB2xB'), StatusKettleSound),
+    2: (Struct('<BxBxBB2xB'), StatusKettleSound),
+    3: (Struct('<2xB5xB2xB'), StatusAirClean),
+    4: (Struct('<B7xB'), StatusSocket),
+    5: (Struct('<9B'), StatusCooker),
+}
+
+VERSION = Struct('<BB')
+STAT_WATTS = Struct('<6xHB')
+STAT_STARTS = Struct('<3xH')
+
+BYTE = Struct('<B')
+SYNC_TIME = Struct('<Ii')  # utc timestamp, timezone offset in seconds
+MODE_KETTLE = Struct('<BxBx')  # type 0
+MODE_KETTLE_EXT = Struct('<BxB10xB2x')  # types 1, 2
+MODE_COOKER = Struct('<8B')  # prog, sprog, temp, hours, minutes, dhours, dminutes, heat
+TIMER_COOKER = Struct('<BB')
+BACKLIGHT = Struct('<BBB')
+COLOR = Struct('<16B')
+
+
+def decodeFrame(data) -> Frame:
+    view = memoryview(data)
+    start, iterNum, cmd = HEADER.unpack_from(view)
+
+    return Frame(iterNum, cmd, view[3:-1])
+
+
+def encodeFrame(iterNum: int, cmd: int, payload=b'') -> bytes:
+    return HEADER.pack(FRAME_START, iterNum, cmd) + payload + b'\xaa'
+
+
+def frameBuffer(cmd: int, size: int) -> bytearray:
+    buffer = bytearray(size + 4)
+    HEADER.pack_into(buffer, 0, FRAME_START, 0, cmd)
+    buffer[-1] = FRAME_END
+
+    return buffer
+
+
+# preallocated frames by command and payload size, only the iter and payload bytes are rewritten.
+# a returned view is valid until the next frame of the same command and size is built,
+# so one builder serves one connection, which writes one frame at a time
+class FrameBuilder:
+    def __init__(self):
+        self._frames = {}
+
+    def frame(self, cmd: int, size: int):
+        key = (cmd, size)
+        frame = self._frames.get(key)
+
+        if frame is None:
+            buffer = frameBuffer(cmd, size)
+            frame = self._frames[key] = (buffer, memoryview(buffer))
+
+        return frame
+
+    def pack(self, iterNum: int, cmd: int, layout: Struct, *values) -> memoryview:
+        buffer, view = self._frames.get((cmd, layout.size)) or self.frame(cmd, layout.size)
+        buffer[1] = iterNum
+        layout.pack_into(buffer, 3, *values)
+
+        return view
+
+    def fill(self, iterNum: int, cmd: int, payload=b'') -> memoryview:
+        buffer, view = self._frames.get((cmd, len(payload))) or self.frame(cmd, len(payload))
+        buffer[1] = iterNum
+        view[3:-1] = payload
+
+        return view
+
+
+def decodeStatus(devType: int, payload):
+    layout, fields = STATUS_LAYOUTS[devType]
+
+    return fields._make(layout.unpack_from(payload))
+
+
+def decodeVersion(payload) -> str:
+    return '%d.%d' % VERSION.unpack_from(payload)
+
+
+def decodeStatWatts(payload) -> int:
+    low, high = STAT_WATTS.unpack_from(payload)
+
+    return low | high << 16
+
+
+def decodeStatStarts(payload) -> int:
+    return STAT_STARTS.unpack_from(payload)[0]
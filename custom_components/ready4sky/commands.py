@@ -0,0 +1,112 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+import functools
+import logging
+
+from .scheduler import (PRIORITY_COMMAND, PRIORITY_POLL)
+
+_LOGGER = logging.getLogger(__name__)
+
+COMMAND_POLL = 'poll'
+COMMAND_MODE = 'mode'
+COMMAND_TEMPERATURE = 'temperature'
+COMMAND_TIMER = 'timer'
+COMMAND_ION = 'ion'
+COMMAND_SOUND = 'sound'
+
+
+class Command:
+    def __init__(self, key, func, refreshes):
+        self.key = key
+        self.func = func
+        self.refreshes = refreshes  # ends with sendStatus
+        self.waiters = []
+
+
+class CommandQueue:
+    def __init__(self, hass):
+        self._hass = hass
+        self._queue = []
+        self._worker = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    async def submit(self, key, func, refreshes=False):
+        future = self._hass.loop.create_future()
+
+        if key == COMMAND_POLL:
+            for queued in self._queue:
+                if queued.refreshes or queued.key == COMMAND_POLL:
+                    queued.waiters.append(future)
+                    return await future
+
+        command = Command(key, func, refreshes)
+        command.waiters.append(future)
+
+        for queued in list(self._queue):
+            if queued.key == key or (refreshes and queued.key == COMMAND_POLL):
+                _LOGGER.debug('Command %s superseded by %s', queued.key, key)
+                self._queue.remove(queued)
+                command.waiters.extend(queued.waiters)
+
+        self._queue.append(command)
+
+        if self._worker is None:
+            self._worker = self._hass.async_create_task(self.run())
+
+        return await future
+
+    async def run(self):
+        command = None
+
+        try:
+            while self._queue:
+                command = self._queue.pop(0)
+
+                try:
+                    result = await command.func()
+                except Exception as ex:
+                    _LOGGER.exception(ex)
+                    result = False
+
+                self.resolve(command, result)
+                command = None
+        finally:
+            # a cancelled worker fails what it did not run, nobody is left waiting
+            pending = ([command] if command is not None else []) + self._queue
+            self._queue = []
+            self._worker = None
+
+            for command in pending:
+                self.resolve(command, False)
+
+    def resolve(self, command, result):
+        for waiter in command.waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+
+    def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+
+
+def queued(key, refreshes=False, capability=None):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if capability is not None and not self._profile.has(capability):
+                _LOGGER.debug('%s is not supported by %s, not queued', func.__name__, self._mac)
+                return False
+
+            async def run():
+                self._conn.priority = PRIORITY_POLL if key == COMMAND_POLL else PRIORITY_COMMAND
+                return await func(self, *args, **kwargs)
+
+            return await self._commands.submit(key, run, refreshes)
+
+        return wrapper
+
+    return decorator
@@ -12,13 +12,37 @@ from homeassistant.const import (
 from homeassistant.helpers import config_validation
 from voluptuous import Schema, Required, Optional, In
 
-from . import DOMAIN, CONF_USE_BACKLIGHT
-from .btle import BTLEConnection
-from .r4sconst import SUPPORTED_DEVICES
+from . import (
+    DOMAIN,
+    CONF_USE_BACKLIGHT,
+    CONF_CONNECTION_MODE,
+    CONF_IDLE_TIMEOUT,
+    CONF_STATS_INTERVAL,
+    CONF_SYNC_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_CONNECTION_SLOTS
+)
+from .btle import (
+    BTLEConnection,
+    CONNECTION_ALWAYS,
+    CONNECTION_IDLE,
+    CONNECTION_PER_OPERATION,
+    CONNECTION_PUSH,
+    DEFAULT_IDLE_TIMEOUT
+)
+from .polling import (DEFAULT_STATS_INTERVAL, DEFAULT_SYNC_INTERVAL)
+from .profiles import getModelProfile
 
 DEFAULT_SCAN_INTERVAL = 60
 DEFAULT_USE_BACKLIGHT = True
 
+CONNECTION_MODES = [
+    CONNECTION_ALWAYS,
+    CONNECTION_IDLE,
+    CONNECTION_PER_OPERATION,
+    CONNECTION_PUSH
+]
+
 
 # @config_entries.HANDLERS.register(DOMAIN)
 class RedmondKettleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -45,18 +69,30 @@ class RedmondKettleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if address.replace(':', '') != bleDevices[address].replace('-', ''):
                 bleDevices[address] += ' (' + address + ')'
 
-            bleDevices[address] += ' - Supported' if SUPPORTED_DEVICES.get(name) is not None else ' - Not supported'
+            bleDevices[address] += ' - Supported' if getModelProfile(name).type is not None else ' - Not supported'
 
         mac = str(user_input.get(CONF_MAC)).upper()
         password = user_input.get(CONF_PASSWORD, secrets.token_hex(8))
         scan_interval = user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
         backlight = user_input.get(CONF_USE_BACKLIGHT, DEFAULT_USE_BACKLIGHT)
+        connection_mode = user_input.get(CONF_CONNECTION_MODE, CONNECTION_IDLE)
+        idle_timeout = user_input.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+        stats_interval = user_input.get(CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL)
+        sync_interval = user_input.get(CONF_SYNC_INTERVAL, DEFAULT_SYNC_INTERVAL)
+        optimistic = user_input.get(CONF_OPTIMISTIC, False)
+        connection_slots = user_input.get(CONF_CONNECTION_SLOTS, 0)
 
         SCHEMA = Schema({
             Required(CONF_MAC, default=mac): In(bleDevices),
             Required(CONF_PASSWORD, default=password): str,
             Optional(CONF_SCAN_INTERVAL, default=scan_interval): int,
-            Optional(CONF_USE_BACKLIGHT, default=backlight): config_validation.boolean
+            Optional(CONF_USE_BACKLIGHT, default=backlight): config_validation.boolean,
+            Optional(CONF_CONNECTION_MODE, default=connection_mode): In(CONNECTION_MODES),
+            Optional(CONF_IDLE_TIMEOUT, default=idle_timeout): int,
+            Optional(CONF_STATS_INTERVAL, default=stats_interval): int,
+            Optional(CONF_SYNC_INTERVAL, default=sync_interval): int,
+            Optional(CONF_OPTIMISTIC, default=optimistic): config_validation.boolean,
+            Optional(CONF_CONNECTION_SLOTS, default=connection_slots): int
         })
 
         return self.async_show_form(step_id='user', data_schema=SCHEMA, errors=errors)
@@ -72,6 +108,10 @@ class RedmondKettleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         mac = user_input.get(CONF_MAC)
         password = user_input.get(CONF_PASSWORD)
         scan_interval = user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        idle_timeout = user_input.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+        stats_interval = user_input.get(CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL)
+        sync_interval = user_input.get(CONF_SYNC_INTERVAL, DEFAULT_SYNC_INTERVAL)
+        connection_slots = user_input.get(CONF_CONNECTION_SLOTS, 0)
         identifier = f'{DOMAIN}[{mac}]'
         if identifier in self._async_current_ids():
             return self.async_abort(reason='already_configured')
@@ -92,7 +132,39 @@ class RedmondKettleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 }
             )
 
-        if SUPPORTED_DEVICES.get(self._bleDevices[mac]) is None:
+        if idle_timeout < 5 or idle_timeout > 600:
+            return await self.show_form(
+                user_input=user_input,
+                errors={
+                    'base': 'wrong_idle_timeout'
+                }
+            )
+
+        if stats_interval < 60 or stats_interval > 86400:
+            return await self.show_form(
+                user_input=user_input,
+                errors={
+                    'base': 'wrong_stats_interval'
+                }
+            )
+
+        if sync_interval < 3600 or sync_interval > 604800:
+            return await self.show_form(
+                user_input=user_input,
+                errors={
+                    'base': 'wrong_sync_interval'
+                }
+            )
+
+        if connection_slots < 0 or connection_slots > 10:
+            return await self.show_form(
+                user_input=user_input,
+                errors={
+                    'base': 'wrong_connection_slots'
+                }
+            )
+
+        if getModelProfile(self._bleDevices[mac]).type is None:
             return await self.show_form(
                 user_input=user_input,
                 errors={
@@ -0,0 +1,26 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+FIELD_AVAILABLE = 'available'
+
+
+class RedmondEntity:
+    # kettle fields the entity renders, the update signal carries the changed ones
+    _fields = frozenset()
+    _rendered = None
+
+    def renderedState(self):
+        return self.available, self.state, self.state_attributes, self.extra_state_attributes
+
+    def handleUpdate(self, changed=None):
+        if changed is not None and FIELD_AVAILABLE not in changed and self._fields.isdisjoint(changed):
+            return
+
+        self.update()
+        rendered = self.renderedState()
+
+        if rendered == self._rendered:
+            return
+
+        self._rendered = rendered
+        self.schedule_update_ha_state()
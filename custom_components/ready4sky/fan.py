@@ -12,7 +12,9 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import DOMAIN, SIGNAL_UPDATE_DATA, STATUS_ON, MODE_BOIL
+from . import DOMAIN, STATUS_ON, MODE_BOIL
+from .entity import RedmondEntity
+from .profiles import CAP_FAN
 
 
 async def async_setup_entry(
@@ -21,11 +23,13 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback
 ) -> None:
     kettle = hass.data[DOMAIN][config_entry.entry_id]
-    if kettle._type == 3:
+    if kettle._profile.has(CAP_FAN):
         async_add_entities([RedmondFan(kettle)])
 
 
-class RedmondFan(FanEntity):
+class RedmondFan(RedmondEntity, FanEntity):
+    _fields = frozenset(['status', 'mode'])
+
     def __init__(self, kettle):
         self._kettle = kettle
         self.entity_description = FanEntityDescription(
@@ -42,22 +46,23 @@ class RedmondFan(FanEntity):
         self._speed = '01'
 
     async def async_added_to_hass(self):
-        self.update()
-        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, SIGNAL_UPDATE_DATA, self.update))
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
 
     def update(self):
+        state = self._kettle.state
+
         self._attr_is_on = False
-        if self._kettle._mode == MODE_BOIL:
+        if state.mode == MODE_BOIL:
             self._speed = '01'
         else:
-            self._speed = self._kettle._mode
+            self._speed = '%02d' % state.mode
         #        if self._kettler._mode == '00' or not self._kettler._status == STATUS_ON:
         #            self._perc = 0
         #        else:
         #            self._perc = ordered_list_item_to_percentage(ORDERED_NAMED_FAN_SPEEDS, self._kettler._mode)
-        if self._kettle._status == STATUS_ON:
+        if state.status == STATUS_ON:
             self._attr_is_on = True
-        self.schedule_update_ha_state()
 
     #    async def async_set_percentage(self, percentage: int) -> None:
     #        if percentage == 0:
@@ -70,7 +75,7 @@ class RedmondFan(FanEntity):
         if speed == '00':
             await self._kettle.modeOff()
         else:
-            await self._kettle.modeFan(speed)
+            await self._kettle.modeFan(int(speed))
 
     async def async_turn_on(self, speed: str = None, percentage: int = None, preset_mode: str = None, **kwargs, ) -> None:
         if speed is not None:
@@ -92,7 +97,7 @@ class RedmondFan(FanEntity):
 
     @property
     def available(self):
-        return self._kettle._available
+        return self._kettle.state.available
 
     @property
     def speed(self):
@@ -0,0 +1,66 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+from collections import deque
+
+BOIL_TEMP = 100
+
+HEATING_WINDOW = 6  # readings in the fit, the window slides along the slowing curve near the target
+MIN_FIT_SPAN = 15  # seconds, the device reports whole degrees, so closer readings give no usable rate
+TEMP_TOLERANCE = 1  # a reading this much below the previous one is noise, more means the heating restarted
+KEEP_WARM_HYSTERESIS = 5  # degrees below the keep warm target before a reheat counts, the hold phase drifts less
+
+
+class HeatingEstimator:
+    def __init__(self, window=HEATING_WINDOW):
+        self._readings = deque(maxlen=window)
+        self._target = None
+        self._eta = None
+
+    @property
+    def eta(self):
+        # loop time the water reaches the target, None until the rate is known
+        return self._eta
+
+    @property
+    def tracking(self):
+        return bool(self._readings)
+
+    def reset(self):
+        self._readings.clear()
+        self._target = None
+        self._eta = None
+
+    def add(self, now, temp, target):
+        if target != self._target or (self._readings and temp < self._readings[-1][1] - TEMP_TOLERANCE):
+            self._readings.clear()
+
+        self._target = target
+        self._readings.append((now, temp))
+        self._eta = self.fit()
+
+    def fit(self):
+        readings = self._readings
+
+        if len(readings) < 2 or readings[-1][0] - readings[0][0] < MIN_FIT_SPAN:
+            return None
+
+        # least squares line through the window, times relative to the first reading
+        start = readings[0][0]
+        count = len(readings)
+        meanTime = sum(now - start for now, temp in readings) / count
+        meanTemp = sum(temp for now, temp in readings) / count
+        covariance = sum((now - start - meanTime) * (temp - meanTemp) for now, temp in readings)
+        variance = sum((now - start - meanTime) ** 2 for now, temp in readings)
+        rate = covariance / variance
+
+        if rate <= 0:
+            return None
+
+        return start + meanTime + (self._target - meanTemp) / rate
+
+    def remaining(self, now):
+        if self._eta is None:
+            return None
+
+        return max(0.0, self._eta - now)
@@ -0,0 +1,191 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+import asyncio
+import logging
+import os
+from collections import namedtuple
+from struct import Struct
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_MAGIC = b'R4SE\x01'
+SAMPLE = Struct('<IIH')  # unix timestamp, energy counter in Wh, starts count
+
+DEFAULT_MAX_BYTES = 64 * 1024
+
+HOUR = 3600
+MIN_POWER_INTERVAL = 60  # the counter counts whole Wh, shorter intervals give no usable power
+
+Sample = namedtuple('Sample', ['time', 'watts', 'times'])
+
+
+def readHistory(path) -> list:
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return []
+
+    if not data.startswith(HISTORY_MAGIC):
+        raise ValueError('%s is not a ready4sky energy history' % path)
+
+    # a torn last record of an interrupted write is dropped
+    end = len(data) - (len(data) - len(HISTORY_MAGIC)) % SAMPLE.size
+
+    return [Sample._make(sample) for sample in SAMPLE.iter_unpack(memoryview(data)[len(HISTORY_MAGIC):end])]
+
+
+def hourlyTotals(samples, after=None, total=0, watts=None) -> list:
+    # (hour start, counter, running total) of every hour with samples after the hour `after`.
+    # the total goes on from `total` and the counter `watts` of the last imported hour, so a log cut
+    # by compact() continues the imported sums instead of starting over.
+    # a counter that went back means the device was reset and counts from zero again
+    rows = []
+
+    for sample in samples:
+        hour = sample.time - sample.time % HOUR
+
+        if after is not None and hour <= after:
+            continue
+
+        if watts is not None:
+            total += sample.watts - watts if sample.watts >= watts else sample.watts
+
+        watts = sample.watts
+
+        if rows and rows[-1][0] == hour:
+            rows[-1] = (hour, sample.watts, total)
+        else:
+            rows.append((hour, sample.watts, total))
+
+    return rows
+
+
+class EnergyHistory:
+    def __init__(self, path, maxBytes=DEFAULT_MAX_BYTES):
+        self._path = path
+        self._maxBytes = maxBytes
+        self._buffer = bytearray()
+        self._lock = asyncio.Lock()
+        self._logged = None  # last sample in the log
+        self._seen = None  # last read of the counters, logged or not
+        self._powerFrom = None  # read the power is measured from
+        self.power = None  # average W since the previous measure
+        self.cycleEnergy = None  # Wh per start over the last reads with new starts
+
+    @property
+    def path(self):
+        return self._path
+
+    def load(self):
+        try:
+            samples = readHistory(self._path)
+        except ValueError as ex:
+            self.moveAside(ex)
+            return
+
+        if not samples:
+            return
+
+        self._logged = self._seen = self._powerFrom = samples[-1]
+
+        for previous, sample in zip(reversed(samples[:-1]), reversed(samples)):
+            if sample.times > previous.times and sample.watts >= previous.watts:
+                self.cycleEnergy = round((sample.watts - previous.watts) / (sample.times - previous.times))
+                break
+
+        _LOGGER.debug('Loaded %d energy samples from %s', len(samples), self._path)
+
+    def add(self, timestamp, watts, times):
+        sample = Sample(int(timestamp), watts, times)
+        seen = self._seen
+        since = self._powerFrom
+
+        if since is None:
+            self._powerFrom = sample
+        elif sample.time - since.time >= MIN_POWER_INTERVAL:
+            self.power = round(max(watts - since.watts, 0) * HOUR / (sample.time - since.time))
+            self._powerFrom = sample
+
+        if seen is not None and times > seen.times and watts >= seen.watts:
+            self.cycleEnergy = round((watts - seen.watts) / (times - seen.times))
+
+        self._seen = sample
+
+        # unchanged counters are not logged, the next change covers the whole interval
+        if self._logged is None or self._logged.watts != watts or self._logged.times != times:
+            self._logged = sample
+            self._buffer += SAMPLE.pack(*sample)
+
+    def takeBuffer(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+
+        return data
+
+    def moveAside(self, reason):
+        # a foreign or broken file is kept for a look, the log starts over next to it
+        bad = self._path + '.bad'
+        os.replace(self._path, bad)
+        _LOGGER.warning('%s, moved to %s', reason, bad)
+
+    def checkedSize(self) -> int:
+        try:
+            with open(self._path, 'rb') as file:
+                header = file.read(len(HISTORY_MAGIC))
+                size = file.seek(0, os.SEEK_END)
+        except FileNotFoundError:
+            return 0
+
+        if header == HISTORY_MAGIC:
+            return size
+
+        # a header torn by an interrupted first write is not worth keeping
+        if HISTORY_MAGIC.startswith(header):
+            os.remove(self._path)
+        else:
+            self.moveAside('%s is not a ready4sky energy history' % self._path)
+
+        return 0
+
+    def write(self, data):
+        if not data:
+            return
+
+        size = self.checkedSize()
+
+        if size and size + len(data) > self._maxBytes:
+            self.compact(data)
+            return
+
+        if size == 0:
+            with open(self._path, 'wb') as file:
+                file.write(HISTORY_MAGIC)
+                file.write(data)
+            return
+
+        with open(self._path, 'r+b') as file:
+            # a torn last record of an interrupted write is cut, so the new ones stay aligned
+            file.truncate(size - (size - len(HISTORY_MAGIC)) % SAMPLE.size)
+            file.seek(0, os.SEEK_END)
+            file.write(data)
+
+    def compact(self, data):
+        # the newest half of the cap is kept, so the log is rewritten once per half of the cap
+        with open(self._path, 'rb') as file:
+            records = file.read()[len(HISTORY_MAGIC):]
+
+        keep = (self._maxBytes - len(HISTORY_MAGIC)) // 2 // SAMPLE.size * SAMPLE.size
+        records = (records[:len(records) - len(records) % SAMPLE.size] + data)[-keep:]
+        temp = self._path + '.tmp'
+
+        with open(temp, 'wb') as file:
+            file.write(HISTORY_MAGIC)
+            file.write(records)
+
+        os.replace(temp, self._path)
+
+    async def async_flush(self, hass):
+        async with self._lock:
+            await hass.async_add_executor_job(self.write, self.takeBuffer())
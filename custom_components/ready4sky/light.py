@@ -16,10 +16,11 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import (
     DOMAIN,
-    SIGNAL_UPDATE_DATA,
     MODE_LIGHT,
     STATUS_ON
 )
+from .entity import RedmondEntity
+from .profiles import CAP_NIGHTLIGHT
 
 
 async def async_setup_entry(
@@ -29,11 +30,13 @@ async def async_setup_entry(
 ) -> None:
     kettle = hass.data[DOMAIN][config_entry.entry_id]
 
-    if kettle._type in [1, 2]:
+    if kettle._profile.has(CAP_NIGHTLIGHT):
         async_add_entities([RedmondNightlight(kettle)])
 
 
-class RedmondNightlight(LightEntity):
+class RedmondNightlight(RedmondEntity, LightEntity):
+    _fields = frozenset(['status', 'mode', 'rgb1', 'nightlight_brightness'])
+
     def __init__(self, kettle):
         self._kettle = kettle
         self.entity_description = LightEntityDescription(
@@ -47,36 +50,35 @@ class RedmondNightlight(LightEntity):
 
         self._attr_color_mode = ColorMode.RGB
         self._attr_supported_color_modes = {ColorMode.RGB}
-        self._attr_rgb_color = kettle._rgb1
-        self._attr_brightness = self._kettle._nightlight_brightness
+        self._attr_rgb_color = kettle.state.rgb1
+        self._attr_brightness = self._kettle.state.nightlight_brightness
         self._attr_is_on = False
 
     async def async_added_to_hass(self):
-        self.update()
-        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, SIGNAL_UPDATE_DATA, self.update))
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
 
     def update(self):
-        self._attr_rgb_color = self._kettle._rgb1
-        self._attr_brightness = self._kettle._nightlight_brightness
+        state = self._kettle.state
+
+        self._attr_rgb_color = state.rgb1
+        self._attr_brightness = state.nightlight_brightness
         self._attr_is_on = False
 
-        if self._kettle._status == STATUS_ON and self._kettle._mode == MODE_LIGHT:
+        if state.status == STATUS_ON and state.mode == MODE_LIGHT:
             self._attr_is_on = True
 
-        self.schedule_update_ha_state()
-
     @property
     def should_poll(self):
         return False
 
     @property
     def available(self):
-        return self._kettle._available
+        return self._kettle.state.available
 
     async def async_turn_on(self, **kwargs):
         self._attr_rgb_color = kwargs.get(ATTR_RGB_COLOR, self._attr_rgb_color)
-        self._kettle._nightlight_brightness = kwargs.get(ATTR_BRIGHTNESS, 255)
-        self._kettle._rgb1 = self._attr_rgb_color
+        self._kettle.setState(rgb1=self._attr_rgb_color, nightlight_brightness=kwargs.get(ATTR_BRIGHTNESS, 255))
 
         await self._kettle.startNightColor()
 
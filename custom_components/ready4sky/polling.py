@@ -0,0 +1,174 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+import logging
+import math
+
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+POLL_FAST_INTERVAL = 5
+POLL_SETUP_PERIOD = 120  # seconds a cooker in program setup is polled fast, a panel left in setup is not
+POLL_IDLE_FACTOR = 5
+POLL_IDLE_MAX = 600
+
+DEFAULT_STATS_INTERVAL = 3600
+DEFAULT_SYNC_INTERVAL = 86400
+
+
+class PollLane:
+    def __init__(self, interval):
+        self.interval = interval
+        self._last = None
+        self._triggered = False
+
+    def isDue(self, now) -> bool:
+        return self._triggered or self._last is None or now - self._last >= self.interval
+
+    def trigger(self):
+        self._triggered = True
+
+    def done(self, now):
+        self._last = now
+        self._triggered = False
+
+
+class PollPhases:
+    def __init__(self, hass):
+        self._hass = hass
+        self._pollers = {}
+        self.epoch = hass.loop.time()
+
+    def add(self, mac, poller):
+        self._pollers[mac] = poller
+        self.spread()
+
+    def remove(self, mac):
+        if self._pollers.pop(mac, None) is not None:
+            self.spread()
+
+    def spread(self):
+        count = len(self._pollers)
+
+        for index, mac in enumerate(sorted(self._pollers)):
+            self._pollers[mac].setPhase(index / count)
+
+
+class PollScheduler:
+    def __init__(self, hass, kettle, interval, phases=None):
+        self._hass = hass
+        self._kettle = kettle
+        self._interval = interval
+        self._phases = phases
+        self._phase = 0.0
+        self._unsub = None
+        self._due = None
+        self._predicted = False
+        self._lastTick = None
+        self._running = False
+        self._skipped = 0
+
+    @property
+    def skipped(self) -> int:
+        return self._skipped
+
+    def start(self):
+        self._lastTick = self._hass.loop.time()
+
+        if self._phases is not None:
+            self._phases.add(self._kettle._mac, self)
+
+        if self._due is None:
+            self.scheduleNext()
+
+    def stop(self):
+        self.cancel()
+
+        if self._phases is not None:
+            self._phases.remove(self._kettle._mac)
+
+    def cancel(self):
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+        self._due = None
+
+    def schedule(self, delay, predicted=False):
+        self.cancel()
+        self._due = self._hass.loop.time() + delay
+        self._predicted = predicted
+        self._unsub = async_call_later(self._hass, delay, self.tick)
+
+    def scheduleNext(self):
+        due, predicted = self.nextDue()
+        self.schedule(max(0.0, due - self._hass.loop.time()), predicted)
+
+    def nextDue(self):
+        due = self.slotAfter(self._kettle.getPollInterval(self._interval), self._lastTick)
+        predicted = self._kettle.predictedPoll()
+
+        # a predicted end of heating is polled right then, off the shared grid
+        if predicted is not None:
+            predicted = max(predicted, self._lastTick + POLL_FAST_INTERVAL)
+
+            if predicted < due:
+                return predicted, True
+
+        return due, False
+
+    def slotAfter(self, interval, since) -> float:
+        if self._phases is None:
+            return since + interval
+
+        # slots sit on a grid shared by all devices, shifted by this device's phase
+        offset = self._phases.epoch + self._phase * interval
+        due = offset + (math.floor((since - offset) / interval) + 1) * interval
+
+        if due - since < interval / 2:
+            due += interval
+
+        return due
+
+    def setPhase(self, phase):
+        if phase == self._phase:
+            return
+
+        _LOGGER.debug('Poll phase of %s set to %.2f', self._kettle._mac, phase)
+        self._phase = phase
+
+        if self._lastTick is not None:
+            self.scheduleNext()
+
+    async def tick(self, now):
+        self._unsub = None
+        self._lastTick = self._hass.loop.time()
+        self.scheduleNext()
+
+        if self._running:
+            self._skipped += 1
+            _LOGGER.debug('Previous poll of %s is still running, tick skipped (%d in total)', self._kettle._mac, self._skipped)
+            return
+
+        self._running = True
+
+        try:
+            await self._kettle.update(now)
+        finally:
+            self._running = False
+
+    def stateChanged(self):
+        if self._due is None:
+            return
+
+        desired, predicted = self.nextDue()
+        now = self._hass.loop.time()
+
+        if desired < self._due - 1:
+            _LOGGER.debug('Poll of %s brought forward by %.0f s', self._kettle._mac, self._due - desired)
+            self.schedule(max(0.0, desired - now), predicted)
+        elif desired > self._due + 1 and (predicted or self._predicted):
+            # the tick planned before the read, a refined prediction or the end of heating moves the poll later
+            _LOGGER.debug('Poll of %s moved later by %.0f s', self._kettle._mac, desired - self._due)
+            self.schedule(max(0.0, desired - now), predicted)
@@ -0,0 +1,107 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+from collections import namedtuple
+
+from . import codec
+from .r4sconst import SUPPORTED_DEVICES
+
+CAP_KETTLE = 'kettle'  # boil and keep warm modes, water heater entity
+CAP_COOKER = 'cooker'  # programs and timer
+CAP_FAN = 'fan'  # speed through SET_TEMPERATURE and AFTER_SPEED
+CAP_ION = 'ion'
+CAP_POWER = 'power'  # plain on / off switch
+CAP_SOUND = 'sound'
+CAP_NIGHTLIGHT = 'nightlight'
+CAP_BACKLIGHT = 'backlight'
+CAP_CLOCK = 'clock'  # SYNC_TIME
+CAP_TEMPERATURE = 'temperature'  # SET_TEMPERATURE
+CAP_RUN = 'run'  # RUN_CURRENT_MODE, without it the mode frame starts the device
+
+
+def kettleFields(status) -> dict:
+    fields = {'temp': status.temp, 'status': status.status, 'mode': status.mode}
+
+    if status.tgtemp != 0:
+        fields['tgtemp'] = status.tgtemp
+
+    return fields
+
+
+def kettleSoundFields(status) -> dict:
+    fields = kettleFields(status)
+    fields['conf_sound_on'] = status.sound == 1
+
+    return fields
+
+
+def deviceFields(status) -> dict:
+    return status._asdict()
+
+
+def cookerFields(status) -> dict:
+    fields = status._asdict()
+    fields['temp'] = status.tgtemp
+
+    if status.tgtemp == 0:
+        del fields['tgtemp']
+
+    return fields
+
+
+class Profile(namedtuple('Profile', [
+    'type',
+    'authReply',
+    'capabilities',
+    'layout',
+    'fields',
+    'statusFields',
+    'modeLayout',
+    'modeExtra'
+])):
+    __slots__ = ()
+
+    def has(self, capability) -> bool:
+        return capability in self.capabilities
+
+    def decodeStatus(self, payload):
+        return self.fields._make(self.layout.unpack_from(payload))
+
+
+def makeProfile(devType, capabilities, statusFields, modeLayout=None, modeExtra=(), authReply=1) -> Profile:
+    layout, fields = codec.STATUS_LAYOUTS[devType]
+
+    return Profile(devType, authReply, frozenset(capabilities), layout, fields, statusFields, modeLayout, modeExtra)
+
+
+PROFILES = {
+    0: makeProfile(0, [CAP_KETTLE], kettleFields, codec.MODE_KETTLE),
+    1: makeProfile(
+        1,
+        [CAP_KETTLE, CAP_RUN, CAP_TEMPERATURE, CAP_SOUND, CAP_NIGHTLIGHT, CAP_BACKLIGHT, CAP_CLOCK],
+        kettleSoundFields,
+        codec.MODE_KETTLE_EXT,
+        (0x80,)
+    ),
+    2: makeProfile(
+        2,
+        [CAP_KETTLE, CAP_RUN, CAP_TEMPERATURE, CAP_SOUND, CAP_NIGHTLIGHT, CAP_BACKLIGHT, CAP_CLOCK],
+        kettleSoundFields,
+        codec.MODE_KETTLE_EXT,
+        (0x80,),
+        authReply=2
+    ),
+    3: makeProfile(3, [CAP_FAN, CAP_ION, CAP_RUN, CAP_TEMPERATURE], deviceFields),
+    4: makeProfile(4, [CAP_POWER, CAP_RUN], deviceFields),
+    5: makeProfile(5, [CAP_COOKER, CAP_RUN, CAP_TEMPERATURE], cookerFields),
+}
+
+PROFILE_UNKNOWN = Profile(None, None, frozenset(), None, None, None, None, ())
+
+
+def getProfile(devType) -> Profile:
+    return PROFILES.get(devType, PROFILE_UNKNOWN)
+
+
+def getModelProfile(name) -> Profile:
+    return getProfile(SUPPORTED_DEVICES.get(name))
@@ -0,0 +1,49 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+MINUTE = 60
+
+
+class CookerProgress:
+    def __init__(self):
+        self._total = None  # program length, s
+        self._finish = None  # loop time the program ends
+        self._finishAt = None  # the same as unix time
+
+    @property
+    def finish(self):
+        return self._finish
+
+    @property
+    def finishAt(self):
+        return self._finishAt
+
+    def reset(self):
+        self._total = None
+        self._finish = None
+        self._finishAt = None
+
+    def sync(self, now, wallNow, totalMinutes, remainingMinutes):
+        self._total = max(totalMinutes, remainingMinutes) * MINUTE
+        upper = remainingMinutes * MINUTE
+
+        # the device counts whole minutes rounded up, a local countdown inside the reported minute is kept
+        if self._finish is not None and upper - MINUTE < self._finish - now <= upper:
+            return
+
+        self._finish = now + upper
+        self._finishAt = wallNow + upper
+
+    def remaining(self, now):
+        if self._finish is None:
+            return None
+
+        return max(0.0, self._finish - now)
+
+    def percent(self, now):
+        remaining = self.remaining(now)
+
+        if remaining is None or not self._total:
+            return None
+
+        return round((self._total - remaining) * 100 / self._total)
@@ -55,22 +55,22 @@ SUPPORTED_DEVICES = {
 }
 
 COOKER_PROGRAMS = {
-    'rice': ['01', '00', '64', '00', '23', '00', '00', '01'],
-    'slow_cooking': ['02', '00', '61', '03', '00', '00', '00', '01'],
-    'pilaf': ['03', '00', '6e', '01', '00', '00', '00', '01'],
-    'frying_vegetables': ['04', '01', 'b4', '00', '12', '00', '00', '01'],
-    'frying_fish': ['04', '02', 'b4', '00', '0c', '00', '00', '01'],
-    'frying_meat': ['04', '03', 'b4', '00', '0f', '00', '00', '01'],
-    'stewing_vegetables': ['05', '01', '64', '00', '28', '00', '00', '01'],
-    'stewing_fish': ['05', '02', '64', '00', '23', '00', '00', '01'],
-    'stewing_meat': ['05', '03', '64', '01', '00', '00', '00', '01'],
-    'pasta': ['06', '00', '64', '00', '08', '00', '00', '01'],
-    'milk_porridge': ['07', '00', '5f', '00', '23', '00', '00', '01'],
-    'soup': ['08', '00', '63', '01', '00', '00', '00', '01'],
-    'yogurt': ['09', '00', '28', '08', '00', '00', '00', '00'],
-    'baking': ['0a', '00', '91', '00', '2d', '00', '00', '01'],
-    'steam_vegetables': ['0b', '01', '64', '00', '1e', '00', '00', '01'],
-    'steam_fish': ['0b', '02', '64', '00', '19', '00', '00', '01'],
-    'steam_meat': ['0b', '03', '64', '00', '28', '00', '00', '01'],
-    'hot': ['0c', '00', '64', '00', '28', '00', '00', '01']
+    'rice': [0x01, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01],
+    'slow_cooking': [0x02, 0x00, 0x61, 0x03, 0x00, 0x00, 0x00, 0x01],
+    'pilaf': [0x03, 0x00, 0x6e, 0x01, 0x00, 0x00, 0x00, 0x01],
+    'frying_vegetables': [0x04, 0x01, 0xb4, 0x00, 0x12, 0x00, 0x00, 0x01],
+    'frying_fish': [0x04, 0x02, 0xb4, 0x00, 0x0c, 0x00, 0x00, 0x01],
+    'frying_meat': [0x04, 0x03, 0xb4, 0x00, 0x0f, 0x00, 0x00, 0x01],
+    'stewing_vegetables': [0x05, 0x01, 0x64, 0x00, 0x28, 0x00, 0x00, 0x01],
+    'stewing_fish': [0x05, 0x02, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01],
+    'stewing_meat': [0x05, 0x03, 0x64, 0x01, 0x00, 0x00, 0x00, 0x01],
+    'pasta': [0x06, 0x00, 0x64, 0x00, 0x08, 0x00, 0x00, 0x01],
+    'milk_porridge': [0x07, 0x00, 0x5f, 0x00, 0x23, 0x00, 0x00, 0x01],
+    'soup': [0x08, 0x00, 0x63, 0x01, 0x00, 0x00, 0x00, 0x01],
+    'yogurt': [0x09, 0x00, 0x28, 0x08, 0x00, 0x00, 0x00, 0x00],
+    'baking': [0x0a, 0x00, 0x91, 0x00, 0x2d, 0x00, 0x00, 0x01],
+    'steam_vegetables': [0x0b, 0x01, 0x64, 0x00, 0x1e, 0x00, 0x00, 0x01],
+    'steam_fish': [0x0b, 0x02, 0x64, 0x00, 0x19, 0x00, 0x00, 0x01],
+    'steam_meat': [0x0b, 0x03, 0x64, 0x00, 0x28, 0x00, 0x00, 0x01],
+    'hot': [0x0c, 0x00, 0x64, 0x00, 0x28, 0x00, 0x00, 0x01]
 }
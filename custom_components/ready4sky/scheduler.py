@@ -0,0 +1,99 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+import asyncio
+import heapq
+import itertools
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+# ESPHome bluetooth proxies allow 3 active connections by default
+DEFAULT_ADAPTER_SLOTS = 3
+SOURCE_DEFAULT = 'default'
+
+# connections in always and push mode hold their slot, a waiter gives up instead of blocking its queue
+DEFAULT_SLOT_TIMEOUT = 30
+
+
+class SlotTimeoutError(Exception):
+    pass
+
+
+class ConnectionScheduler:
+    def __init__(self, hass, slots=DEFAULT_ADAPTER_SLOTS, timeout=DEFAULT_SLOT_TIMEOUT):
+        self._hass = hass
+        self._slots = slots
+        self._timeout = timeout
+        self._sourceSlots = {}
+        self._active = {}
+        self._waiting = {}
+        self._order = itertools.count()
+
+    def setSlots(self, source, slots: int):
+        if self._sourceSlots.get(source) != slots:
+            _LOGGER.debug('Connection slots of %s: %d', source, slots)
+            self._sourceSlots[source] = slots
+            self.wakeWaiting(source)
+
+    def getSlots(self, source) -> int:
+        return self._sourceSlots.get(source, self._slots)
+
+    def queueDepth(self, source=None) -> int:
+        if source is not None:
+            return len(self._waiting.get(source, []))
+
+        return sum(len(waiting) for waiting in self._waiting.values())
+
+    async def acquire(self, source, priority=PRIORITY_POLL):
+        waiting = self._waiting.setdefault(source, [])
+        active = self._active.get(source, 0)
+
+        if active < self.getSlots(source) and not waiting:
+            self._active[source] = active + 1
+            return
+
+        future = self._hass.loop.create_future()
+        heapq.heappush(waiting, (priority, next(self._order), future))
+
+        _LOGGER.debug('Connection slot on %s busy, queue depth: %s', source, len(waiting))
+
+        try:
+            await asyncio.wait_for(future, self._timeout)
+        except asyncio.TimeoutError:
+            waiting[:] = [item for item in waiting if item[2] is not future]
+            heapq.heapify(waiting)
+            raise SlotTimeoutError('No connection slot on %s within %g s' % (source, self._timeout))
+        except BaseException:
+            if future.cancelled():
+                waiting[:] = [item for item in waiting if item[2] is not future]
+                heapq.heapify(waiting)
+            else:
+                self.release(source)
+            raise
+
+    def release(self, source):
+        waiting = self._waiting.get(source, [])
+
+        while waiting:
+            future = heapq.heappop(waiting)[2]
+
+            if not future.done():
+                future.set_result(True)
+                return
+
+        self._active[source] = max(self._active.get(source, 0) - 1, 0)
+
+    def wakeWaiting(self, source):
+        # a grown budget admits waiters right away
+        waiting = self._waiting.get(source, [])
+
+        while waiting and self._active.get(source, 0) < self.getSlots(source):
+            future = heapq.heappop(waiting)[2]
+
+            if not future.done():
+                self._active[source] = self._active.get(source, 0) + 1
+                future.set_result(True)
@@ -6,7 +6,10 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import DOMAIN
-from .sensors.energy import RedmondEnergySensor
+from .profiles import (CAP_COOKER, CAP_KETTLE)
+from .sensors.energy import (RedmondCycleEnergySensor, RedmondEnergySensor, RedmondPowerSensor)
+from .sensors.heating import RedmondReadyAtSensor
+from .sensors.progress import (RedmondProgressSensor, progressDescriptions)
 from .sensors.status import RedmondSensor
 
 
@@ -17,8 +20,18 @@ async def async_setup_entry(
 ) -> None:
     kettle = hass.data[DOMAIN][config_entry.entry_id]
 
-    if kettle._type in [0, 1, 2, 3, 4, 5]:
+    if kettle._profile.type is not None:
         async_add_entities([
             RedmondSensor(kettle),
-            RedmondEnergySensor(kettle)
+            RedmondEnergySensor(kettle),
+            RedmondPowerSensor(kettle),
+            RedmondCycleEnergySensor(kettle)
+        ])
+
+    if kettle._profile.has(CAP_KETTLE):
+        async_add_entities([RedmondReadyAtSensor(kettle)])
+
+    if kettle._profile.has(CAP_COOKER):
+        async_add_entities([
+            RedmondProgressSensor(kettle, description) for description in progressDescriptions(kettle._name)
         ])
@@ -1,17 +1,19 @@
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass, SensorEntity, SensorEntityDescription
-from homeassistant.const import UnitOfEnergy
+from homeassistant.const import (UnitOfEnergy, UnitOfPower)
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 
 from .. import (
     DOMAIN,
-    SIGNAL_UPDATE_DATA,
     ATTR_WORK_ALLTIME,
     ATTR_TIMES
 )
+from ..entity import RedmondEntity
 
 
-class RedmondEnergySensor(SensorEntity):
+class RedmondEnergySensor(RedmondEntity, SensorEntity):
+    _fields = frozenset(['Watts', 'alltime', 'times'])
+
     def __init__(self, kettle):
         self._kettle = kettle
         self.entity_description = SensorEntityDescription(
@@ -25,15 +27,14 @@ class RedmondEnergySensor(SensorEntity):
 
         self._attr_unique_id = f'{DOMAIN}[{kettle._mac}][sensor][{self.entity_description.key}]'
         self._attr_device_info = DeviceInfo(connections={("mac", kettle._mac)})
-        self._attr_native_value = self._kettle._Watts
+        self._attr_native_value = self._kettle.state.Watts
 
     async def async_added_to_hass(self):
-        self.update()
-        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, SIGNAL_UPDATE_DATA, self.update))
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
 
     def update(self):
-        self._attr_native_value = self._kettle._Watts
-        self.schedule_update_ha_state()
+        self._attr_native_value = self._kettle.state.Watts
 
     @property
     def should_poll(self):
@@ -41,11 +42,78 @@ class RedmondEnergySensor(SensorEntity):
 
     @property
     def available(self):
-        return self._kettle._available
+        return self._kettle.state.available
 
     @property
     def extra_state_attributes(self):
         return {
-            ATTR_TIMES: self._kettle._times,
-            ATTR_WORK_ALLTIME: self._kettle._alltime,
+            ATTR_TIMES: self._kettle.state.times,
+            ATTR_WORK_ALLTIME: self._kettle.state.alltime,
         }
+
+
+class RedmondPowerSensor(RedmondEntity, SensorEntity):
+    _fields = frozenset(['power'])
+
+    def __init__(self, kettle):
+        self._kettle = kettle
+        self.entity_description = SensorEntityDescription(
+            key="power",
+            name=kettle._name + " Average power",
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.POWER,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfPower.WATT
+        )
+
+        self._attr_unique_id = f'{DOMAIN}[{kettle._mac}][sensor][{self.entity_description.key}]'
+        self._attr_device_info = DeviceInfo(connections={("mac", kettle._mac)})
+        self._attr_native_value = self._kettle.state.power
+
+    async def async_added_to_hass(self):
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
+
+    def update(self):
+        self._attr_native_value = self._kettle.state.power
+
+    @property
+    def should_poll(self):
+        return False
+
+    @property
+    def available(self):
+        return self._kettle.state.available
+
+
+class RedmondCycleEnergySensor(RedmondEntity, SensorEntity):
+    _fields = frozenset(['cycle_energy'])
+
+    def __init__(self, kettle):
+        self._kettle = kettle
+        self.entity_description = SensorEntityDescription(
+            key="cycle_energy",
+            name=kettle._name + " Last cycle energy",
+            icon="mdi:lightning-bolt-circle",
+            device_class=SensorDeviceClass.ENERGY,
+            native_unit_of_measurement=UnitOfEnergy.WATT_HOUR
+        )
+
+        self._attr_unique_id = f'{DOMAIN}[{kettle._mac}][sensor][{self.entity_description.key}]'
+        self._attr_device_info = DeviceInfo(connections={("mac", kettle._mac)})
+        self._attr_native_value = self._kettle.state.cycle_energy
+
+    async def async_added_to_hass(self):
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
+
+    def update(self):
+        self._attr_native_value = self._kettle.state.cycle_energy
+
+    @property
+    def should_poll(self):
+        return False
+
+    @property
+    def available(self):
+        return self._kettle.state.available
@@ -0,0 +1,38 @@
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorEntityDescription
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
+
+from .. import DOMAIN
+from ..entity import RedmondEntity
+
+
+class RedmondReadyAtSensor(RedmondEntity, SensorEntity):
+    _fields = frozenset(['ready_at'])
+
+    def __init__(self, kettle):
+        self._kettle = kettle
+        self.entity_description = SensorEntityDescription(
+            key="ready_at",
+            name=kettle._name + " Ready at",
+            icon="mdi:timer-sand",
+            device_class=SensorDeviceClass.TIMESTAMP
+        )
+
+        self._attr_unique_id = f'{DOMAIN}[{kettle._mac}][sensor][{self.entity_description.key}]'
+        self._attr_device_info = DeviceInfo(connections={("mac", kettle._mac)})
+        self._attr_native_value = self._kettle.state.ready_at
+
+    async def async_added_to_hass(self):
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
+
+    def update(self):
+        self._attr_native_value = self._kettle.state.ready_at
+
+    @property
+    def should_poll(self):
+        return False
+
+    @property
+    def available(self):
+        return self._kettle.state.available
@@ -0,0 +1,58 @@
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorEntityDescription
+from homeassistant.const import (PERCENTAGE, UnitOfTime)
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
+
+from .. import DOMAIN
+from ..entity import RedmondEntity
+
+
+def progressDescriptions(name):
+    # keys are the state fields the sensors show
+    return [
+        SensorEntityDescription(
+            key="cook_remaining",
+            name=name + " Remaining time",
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MINUTES
+        ),
+        SensorEntityDescription(
+            key="cook_finish",
+            name=name + " Finish at",
+            icon="mdi:clock-end",
+            device_class=SensorDeviceClass.TIMESTAMP
+        ),
+        SensorEntityDescription(
+            key="cook_progress",
+            name=name + " Progress",
+            icon="mdi:progress-clock",
+            native_unit_of_measurement=PERCENTAGE
+        )
+    ]
+
+
+class RedmondProgressSensor(RedmondEntity, SensorEntity):
+    def __init__(self, kettle, description):
+        self._kettle = kettle
+        self.entity_description = description
+        self._fields = frozenset([description.key])
+
+        self._attr_unique_id = f'{DOMAIN}[{kettle._mac}][sensor][{self.entity_description.key}]'
+        self._attr_device_info = DeviceInfo(connections={("mac", kettle._mac)})
+        self._attr_native_value = getattr(self._kettle.state, description.key)
+
+    async def async_added_to_hass(self):
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
+
+    def update(self):
+        self._attr_native_value = getattr(self._kettle.state, self.entity_description.key)
+
+    @property
+    def should_poll(self):
+        return False
+
+    @property
+    def available(self):
+        return self._kettle.state.available
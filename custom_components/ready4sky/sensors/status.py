@@ -4,7 +4,6 @@ from homeassistant.helpers.entity import DeviceInfo
 
 from .. import (
     DOMAIN,
-    SIGNAL_UPDATE_DATA,
     STATUS_ON,
     MODE_BOIL,
     MODE_KEEP_WARM,
@@ -12,11 +11,18 @@ from .. import (
     ATTR_SYNC,
     COOKER_STATUS_PROGRAM,
     COOKER_STATUS_KEEP_WARM,
-    COOKER_STATUS_DELAYED_START, ATTR_TIMER_SET, ATTR_TIMER_CURR
+    COOKER_STATUS_DELAYED_START, ATTR_TIMER_SET, ATTR_TIMER_CURR,
+    ATTR_CONNECTION_QUEUE,
+    ATTR_RSSI,
+    ATTR_SKIPPED_POLLS
 )
+from ..entity import RedmondEntity
+from ..profiles import (CAP_COOKER, CAP_KETTLE)
 
 
-class RedmondSensor(SensorEntity):
+class RedmondSensor(RedmondEntity, SensorEntity):
+    _fields = frozenset(['status', 'mode', 'time_upd', 'ph', 'pm', 'th', 'tm'])
+
     def __init__(self, kettle):
         self._kettle = kettle
         self.entity_description = SensorEntityDescription(
@@ -31,40 +37,40 @@ class RedmondSensor(SensorEntity):
         self._attr_device_info = DeviceInfo(connections={("mac", kettle._mac)})
 
     async def async_added_to_hass(self):
-        self.update()
-        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, SIGNAL_UPDATE_DATA, self.update))
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
 
     def update(self):
+        state = self._kettle.state
+
         self._attr_native_value = 'off'
 
         # Cooker
-        if self._kettle._type == 5:
-            if self._kettle._status == COOKER_STATUS_PROGRAM:
+        if self._kettle._profile.has(CAP_COOKER):
+            if state.status == COOKER_STATUS_PROGRAM:
                 self._attr_native_value = 'program'
-            elif self._kettle._status == STATUS_ON:
+            elif state.status == STATUS_ON:
                 self._attr_native_value = 'on'
-            elif self._kettle._status == COOKER_STATUS_KEEP_WARM:
+            elif state.status == COOKER_STATUS_KEEP_WARM:
                 self._attr_native_value = 'keep_warm'
-            elif self._kettle._status == COOKER_STATUS_DELAYED_START:
+            elif state.status == COOKER_STATUS_DELAYED_START:
                 self._attr_native_value = 'delayed_start'
 
-        elif self._kettle._status == STATUS_ON:
-            if self._kettle._type in [3, 4]:
+        elif state.status == STATUS_ON:
+            if not self._kettle._profile.has(CAP_KETTLE):
                 self._attr_native_value = 'on'
-            elif self._kettle._mode == MODE_BOIL:
+            elif state.mode == MODE_BOIL:
                 self._attr_native_value = 'boil'
-            elif self._kettle._mode == MODE_KEEP_WARM:
+            elif state.mode == MODE_KEEP_WARM:
                 self._attr_native_value = 'keep_warm'
-            elif self._kettle._mode == MODE_LIGHT:
+            elif state.mode == MODE_LIGHT:
                 self._attr_native_value = 'light'
     
-        self._sync = str(self._kettle._time_upd)
-
-        if self._kettle._type == 5:
-            self._timer_prog = str(self._kettle._ph) + ':' + str(self._kettle._pm)
-            self._timer_curr = str(self._kettle._th) + ':' + str(self._kettle._tm)
+        self._sync = str(state.time_upd)
 
-        self.schedule_update_ha_state()
+        if self._kettle._profile.has(CAP_COOKER):
+            self._timer_prog = str(state.ph) + ':' + str(state.pm)
+            self._timer_curr = str(state.th) + ':' + str(state.tm)
 
     @property
     def should_poll(self):
@@ -76,15 +82,18 @@ class RedmondSensor(SensorEntity):
 
     @property
     def available(self):
-        return self._kettle._available
+        return self._kettle.state.available
 
     @property
     def extra_state_attributes(self):
         attributes = {
-            ATTR_SYNC: str(self._sync)
+            ATTR_SYNC: str(self._sync),
+            ATTR_CONNECTION_QUEUE: self._kettle._conn.queueDepth,
+            ATTR_RSSI: self._kettle._conn.rssi,
+            ATTR_SKIPPED_POLLS: self._kettle.skippedPolls
         }
 
-        if self._kettle._type == 5:
+        if self._kettle._profile.has(CAP_COOKER):
             attributes[ATTR_TIMER_SET] = self._timer_prog
             attributes[ATTR_TIMER_CURR] = self._timer_curr
 
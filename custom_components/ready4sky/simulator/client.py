@@ -0,0 +1,125 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+import asyncio
+import functools
+import logging
+import random
+
+from bleak import BleakError
+
+from ..btle import (UART_RX_CHAR_UUID, UART_TX_CHAR_UUID)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SimulatedBleakClient:
+    def __init__(
+        self,
+        device,
+        disconnected_callback=None,
+        latency=0.05,
+        jitter=0.02,
+        loss=0.0,
+        disconnectRate=0.0,
+        connectLatency=0.5,
+        connectFailure=0.0,
+        rand=random
+    ):
+        self._device = device
+        self._disconnectedCallback = disconnected_callback
+        self._latency = latency
+        self._jitter = jitter
+        self._loss = loss
+        self._disconnectRate = disconnectRate
+        self._connectLatency = connectLatency
+        self._connectFailure = connectFailure
+        self._random = rand
+        self._connected = False
+        self._notify = None
+        self.services = None
+
+    @property
+    def address(self):
+        return self._device.address
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def delay(self, latency) -> float:
+        return max(0.0, latency + self._random.uniform(-self._jitter, self._jitter))
+
+    async def connect(self, **kwargs):
+        await asyncio.sleep(self.delay(self._connectLatency))
+
+        if self._random.random() < self._connectFailure:
+            raise BleakError('Simulated connect failure to %s' % self.address)
+
+        self._connected = True
+
+        return True
+
+    async def disconnect(self):
+        self.dropLink()
+
+        return True
+
+    def dropLink(self):
+        if not self._connected:
+            return
+
+        self._connected = False
+        self._notify = None
+
+        if self._disconnectedCallback is not None:
+            self._disconnectedCallback(self)
+
+    async def clear_cache(self):
+        return True
+
+    async def start_notify(self, uuid, callback, **kwargs):
+        if not self._connected:
+            raise BleakError('Not connected')
+
+        if str(uuid).upper() != UART_TX_CHAR_UUID:
+            raise BleakError('Characteristic %s not found' % uuid)
+
+        self._notify = callback
+
+    async def stop_notify(self, uuid):
+        self._notify = None
+
+    async def write_gatt_char(self, uuid, data, response=False):
+        if not self._connected:
+            raise BleakError('Not connected')
+
+        if str(uuid).upper() != UART_RX_CHAR_UUID:
+            raise BleakError('Characteristic %s not found' % uuid)
+
+        await asyncio.sleep(self.delay(self._latency / 2))
+
+        if self._random.random() < self._disconnectRate:
+            _LOGGER.debug('Simulated disconnect of %s', self.address)
+            self.dropLink()
+            raise BleakError('Simulated disconnect of %s' % self.address)
+
+        reply = self._device.handle(bytes(data))
+
+        if reply is None or self._random.random() < self._loss:
+            return
+
+        asyncio.get_running_loop().call_later(self.delay(self._latency / 2), self.deliver, reply)
+
+    def deliver(self, reply):
+        if self._notify is not None:
+            self._notify(None, bytearray(reply))
+
+    def push(self):
+        self.deliver(self._device.pushStatus())
+
+
+def attach(conn, device, **options):
+    conn.setClientFactory(functools.partial(SimulatedBleakClient, **options), device)
+
+    return conn
@@ -0,0 +1,234 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+import time
+
+from .. import (
+    RedmondCommand,
+    STATUS_OFF,
+    STATUS_ON,
+    COOKER_STATUS_PROGRAM,
+    COOKER_STATUS_KEEP_WARM,
+    MODE_BOIL,
+    MODE_KEEP_WARM
+)
+from .. import codec
+from ..r4sconst import SUPPORTED_DEVICES
+
+PAYLOAD_SIZE = 16
+
+AMBIENT_TEMP = 20
+BOIL_TEMP = 100
+
+ACK = b'\x01'
+
+
+class SimulatedDevice:
+    def __init__(self, name, address='00:00:00:00:00:00', firmware=(4, 11), clock=time.monotonic):
+        self.name = name
+        self.address = address
+        self.type = SUPPORTED_DEVICES[name]
+        self.firmware = firmware
+        self.clock = clock
+        self.pairing = True
+        self.key = None
+
+        self.mode = MODE_BOIL
+        self.status = STATUS_OFF
+        self.tgtemp = 0
+        self.temp = AMBIENT_TEMP
+        self.sound = 1
+        self.ion = 0
+        self.prog = 0
+        self.sprog = 0
+        self.ph = 0
+        self.pm = 0
+        self.th = 0
+        self.tm = 0
+        self.watts = 0
+        self.starts = 0
+
+        self.heatingRate = 1.0  # celsius per second
+        self.coolingRate = 0.02
+        self.power = 2200  # watts
+        self._lastAdvance = clock()
+        self._timerSeconds = 0.0
+
+        self._handlers = {
+            RedmondCommand.AUTH: self.auth,
+            RedmondCommand.VERSION: self.version,
+            RedmondCommand.RUN_CURRENT_MODE: self.runMode,
+            RedmondCommand.STOP_CURRENT_MODE: self.stopMode,
+            RedmondCommand.SET_STATUS_MODE: self.setMode,
+            RedmondCommand.GET_STATUS_MODE: self.getStatus,
+            RedmondCommand.SET_TEMPERATURE: self.setTemperature,
+            RedmondCommand.SET_IONIZATION: self.setIonization,
+            RedmondCommand.SET_SOUND: self.setSound,
+            RedmondCommand.SET_TIME_COOKER: self.setTimer,
+            RedmondCommand.GET_STATISTICS_WATT: self.getWatts,
+            RedmondCommand.GET_STARTS_COUNT: self.getStarts,
+        }
+
+    def handle(self, data):
+        frame = codec.decodeFrame(data)
+        self.advance()
+
+        handler = self._handlers.get(frame.cmd, self.ack)
+        payload = handler(frame.payload)
+
+        if payload is None:
+            return None
+
+        return codec.encodeFrame(frame.iter, frame.cmd, payload)
+
+    def pushStatus(self):
+        self.advance()
+
+        return codec.encodeFrame(0, RedmondCommand.GET_STATUS_MODE, self.getStatus(b''))
+
+    def ack(self, payload):
+        return ACK
+
+    def auth(self, payload):
+        key = bytes(payload)
+
+        if self.pairing and self.key is None:
+            self.key = key
+
+        if key != self.key:
+            return b'\x00'
+
+        return b'\x02' if self.type == 2 else b'\x01'
+
+    def version(self, payload):
+        return codec.VERSION.pack(*self.firmware)
+
+    def runMode(self, payload):
+        if self.type == 5:
+            self._timerSeconds = (self.th * 60 + self.tm) * 60
+
+        self.status = STATUS_ON
+
+        return ACK
+
+    def stopMode(self, payload):
+        self.status = STATUS_OFF
+
+        return ACK
+
+    def setMode(self, payload):
+        if self.type == 0:
+            self.mode, tgtemp = codec.MODE_KETTLE.unpack_from(payload)
+            self.tgtemp = tgtemp or self.tgtemp
+            self.status = STATUS_ON
+        elif self.type in [1, 2]:
+            self.mode, tgtemp, _ = codec.MODE_KETTLE_EXT.unpack_from(payload)
+            self.tgtemp = tgtemp or self.tgtemp
+        elif self.type == 5:
+            self.prog, self.sprog, self.tgtemp, self.ph, self.pm, dhours, dminutes, self.mode = \
+                codec.MODE_COOKER.unpack_from(payload)
+            self.th, self.tm = self.ph, self.pm
+            self.status = COOKER_STATUS_PROGRAM
+
+        return ACK
+
+    def setTemperature(self, payload):
+        value = payload[0]
+
+        if self.type == 3:
+            self.mode = value
+        else:
+            self.tgtemp = value
+
+        return ACK
+
+    def setIonization(self, payload):
+        self.ion = payload[0]
+
+        return ACK
+
+    def setSound(self, payload):
+        self.sound = payload[0]
+
+        return ACK
+
+    def setTimer(self, payload):
+        self.th, self.tm = codec.TIMER_COOKER.unpack_from(payload)
+        self.ph, self.pm = self.th, self.tm
+        self._timerSeconds = (self.th * 60 + self.tm) * 60
+
+        return ACK
+
+    def getStatus(self, payload):
+        layout, fields = codec.STATUS_LAYOUTS[self.type]
+        values = {
+            'mode': self.mode,
+            'status': self.status,
+            'tgtemp': self.tgtemp,
+            'temp': int(self.temp),
+            'sound': self.sound,
+            'ion': self.ion,
+            'prog': self.prog,
+            'sprog': self.sprog,
+            'ph': self.ph,
+            'pm': self.pm,
+            'th': self.th,
+            'tm': self.tm,
+        }
+
+        response = bytearray(PAYLOAD_SIZE)
+        layout.pack_into(response, 0, *(values[field] for field in fields._fields))
+
+        return bytes(response)
+
+    def getWatts(self, payload):
+        watts = int(self.watts)
+        response = bytearray(PAYLOAD_SIZE)
+        codec.STAT_WATTS.pack_into(response, 0, watts & 0xffff, watts >> 16 & 0xff)
+
+        return bytes(response)
+
+    def getStarts(self, payload):
+        response = bytearray(PAYLOAD_SIZE)
+        codec.STAT_STARTS.pack_into(response, 0, self.starts)
+
+        return bytes(response)
+
+    def advance(self):
+        now = self.clock()
+        elapsed = now - self._lastAdvance
+        self._lastAdvance = now
+
+        if self.type in [0, 1, 2]:
+            self.advanceKettle(elapsed)
+        elif self.type == 5:
+            self.advanceCooker(elapsed)
+
+    def advanceKettle(self, elapsed):
+        if self.status != STATUS_ON or self.mode not in [MODE_BOIL, MODE_KEEP_WARM]:
+            self.temp = max(AMBIENT_TEMP, self.temp - self.coolingRate * elapsed)
+            return
+
+        target = BOIL_TEMP if self.mode == MODE_BOIL else self.tgtemp
+
+        if self.temp < target:
+            heating = min(elapsed, (target - self.temp) / self.heatingRate)
+            self.temp += self.heatingRate * heating
+            self.watts += self.power * heating / 3600
+
+        if self.mode == MODE_BOIL and self.temp >= BOIL_TEMP:
+            self.status = STATUS_OFF
+            self.starts += 1
+
+    def advanceCooker(self, elapsed):
+        if self.status != STATUS_ON:
+            return
+
+        self._timerSeconds = max(0.0, self._timerSeconds - elapsed)
+        minutes = int(self._timerSeconds + 59) // 60
+        self.th, self.tm = divmod(minutes, 60)
+        self.watts += self.power * elapsed / 3600 / 4
+
+        if self._timerSeconds == 0:
+            self.starts += 1
+            self.status = COOKER_STATUS_KEEP_WARM if self.mode == 1 else STATUS_OFF
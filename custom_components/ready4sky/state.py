@@ -0,0 +1,37 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+from collections import namedtuple
+
+# immutable device state, replaced as a whole on every change, seq grows with each replacement
+DeviceState = namedtuple('DeviceState', [
+    'seq',
+    'available',
+    'time_upd',
+    'status',  # may be 0 - OFF or 2 - ON | for cooker 0 - off   1 - setup program   2 - on  4 - heat   5 - delayed start
+    'mode',  # 0 - boil, 1 - heat to temp, 3 - backlight | for cooker 0 - heat after cook, 1 - off after cook | for fan 0-6 - speed
+    'temp',
+    'tgtemp',
+    'ion',  # 0 - off   1 - on
+    'conf_sound_on',
+    'prog',  # program
+    'sprog',  # subprogram
+    'ph',  # program hours
+    'pm',  # program min
+    'th',  # timer hours
+    'tm',  # timer min
+    'rgb1',
+    'nightlight_brightness',
+    'Watts',
+    'alltime',
+    'times',
+    'power',  # average W between statistics reads at least a minute apart, hourly by default
+    'cycle_energy',  # Wh of the last heating cycle
+    'ready_at',  # utc datetime the water reaches the target, None while not heating or not yet known
+    'cook_remaining',  # minutes left of the running cooker program, counted down locally between polls
+    'cook_finish',  # utc datetime the program ends
+    'cook_progress'  # percent of the program done
+])
+
+# fields published to the entities
+STATE_FIELDS = DeviceState._fields[1:]
@@ -9,6 +9,7 @@ from .switches.humidifier_ionization import RedmondSwitchIonization
 from .switches.power_switch import RedmondPowerSwitch
 from .switches.conf_sound import RedmondConfSwitchSound
 from . import DOMAIN
+from .profiles import (CAP_ION, CAP_POWER, CAP_SOUND)
 
 
 async def async_setup_entry(
@@ -18,15 +19,15 @@ async def async_setup_entry(
 ) -> None:
     kettle = hass.data[DOMAIN][config_entry.entry_id]
 
-    if kettle._type in [1, 2]:
+    if kettle._profile.has(CAP_SOUND):
         async_add_entities([
             RedmondConfSwitchSound(kettle)
         ])
-    elif kettle._type == 3:
+    elif kettle._profile.has(CAP_ION):
         async_add_entities([
             RedmondSwitchIonization(kettle)
         ])
-    elif kettle._type == 4:
+    elif kettle._profile.has(CAP_POWER):
         async_add_entities([
             RedmondPowerSwitch(kettle)
         ])
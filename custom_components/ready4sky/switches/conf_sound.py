@@ -28,11 +28,11 @@ class RedmondConfSwitchSound(SwitchEntity):
 
     @property
     def available(self):
-        return self._kettle._available
+        return self._kettle.state.available
 
     @property
     def is_on(self):
-        return self._kettle._conf_sound_on
+        return self._kettle.state.conf_sound_on
 
     async def async_turn_on(self, **kwargs):
         await self._kettle.setConfEnableSound(True)
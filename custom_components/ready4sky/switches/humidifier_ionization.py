@@ -2,10 +2,13 @@ from homeassistant.components.switch import SwitchEntity, SwitchEntityDescriptio
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 
-from .. import DOMAIN, SIGNAL_UPDATE_DATA
+from .. import DOMAIN
+from ..entity import RedmondEntity
 
 
-class RedmondSwitchIonization(SwitchEntity):
+class RedmondSwitchIonization(RedmondEntity, SwitchEntity):
+    _fields = frozenset(['ion'])
+
 
     def __init__(self, kettle):
         self._kettle = kettle
@@ -25,11 +28,11 @@ class RedmondSwitchIonization(SwitchEntity):
         return f"{DOMAIN}[{self._kettle._mac}][switch][{self.entity_description.key}]"
 
     async def async_added_to_hass(self):
-        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, SIGNAL_UPDATE_DATA, self.update))
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
 
     def update(self):
-        self._attr_is_on = self._kettle._ion == '01'
-        self.schedule_update_ha_state()
+        self._attr_is_on = self._kettle.state.ion == 1
 
     @property
     def should_poll(self):
@@ -37,10 +40,10 @@ class RedmondSwitchIonization(SwitchEntity):
 
     @property
     def available(self):
-        return self._kettle._available
+        return self._kettle.state.available
 
     async def async_turn_on(self, **kwargs):
-        await self._kettle.modeIon('01')
+        await self._kettle.modeIon(1)
 
     async def async_turn_off(self, **kwargs):
-        await self._kettle.modeIon('00')
+        await self._kettle.modeIon(0)
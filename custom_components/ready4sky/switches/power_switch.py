@@ -2,10 +2,13 @@ from homeassistant.components.switch import SwitchEntity, SwitchEntityDescriptio
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 
-from .. import DOMAIN, SIGNAL_UPDATE_DATA, RedmondKettle, MODE_BOIL, STATUS_ON
+from .. import DOMAIN, RedmondKettle, MODE_BOIL, STATUS_ON
+from ..entity import RedmondEntity
 
 
-class RedmondPowerSwitch(SwitchEntity):
+class RedmondPowerSwitch(RedmondEntity, SwitchEntity):
+    _fields = frozenset(['status', 'mode'])
+
     def __init__(self, kettle: RedmondKettle):
         self._kettle = kettle
         self.entity_description = SwitchEntityDescription(
@@ -18,13 +21,15 @@ class RedmondPowerSwitch(SwitchEntity):
         self._attr_device_info = DeviceInfo(connections={("mac", kettle._mac)})
 
     async def async_added_to_hass(self):
-        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, SIGNAL_UPDATE_DATA, self.update))
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
 
     def update(self):
+        state = self._kettle.state
+
         self._attr_is_on = False
-        if self._kettle._status == STATUS_ON and self._kettle._mode == MODE_BOIL:
+        if state.status == STATUS_ON and state.mode == MODE_BOIL:
             self._attr_is_on = True
-        self.schedule_update_ha_state()
 
     @property
     def should_poll(self):
@@ -32,7 +37,7 @@ class RedmondPowerSwitch(SwitchEntity):
 
     @property
     def available(self):
-        return self._kettle._available
+        return self._kettle.state.available
 
     async def async_turn_on(self, **kwargs):
         await self._kettle.modeOn()
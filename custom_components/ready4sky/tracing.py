@@ -0,0 +1,140 @@
+#!/usr/local/bin/python3
+# coding: utf-8
+
+import asyncio
+import logging
+import os
+import time
+from struct import Struct
+
+from .codec import decodeFrame
+
+_LOGGER = logging.getLogger(__name__)
+
+DIRECTION_OUT = 0
+DIRECTION_IN = 1
+
+TRACE_MAGIC = b'R4ST\x01'
+RECORD = Struct('<dB6sH')  # monotonic timestamp, direction, mac, length
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+
+
+def packMac(mac: str) -> bytes:
+    return bytes.fromhex(mac.replace(':', ''))
+
+
+def unpackMac(raw: bytes) -> str:
+    return ':'.join('%02X' % byte for byte in raw)
+
+
+class TraceRecorder:
+    def __init__(self, path, maxBytes=DEFAULT_MAX_BYTES, backupCount=DEFAULT_BACKUP_COUNT, clock=time.monotonic):
+        self._path = path
+        self._maxBytes = maxBytes
+        self._backupCount = backupCount
+        self._clock = clock
+        self._buffer = bytearray()
+        self._macs = {}
+
+    @property
+    def path(self):
+        return self._path
+
+    def record(self, direction, mac, data):
+        raw = self._macs.get(mac)
+
+        if raw is None:
+            raw = self._macs[mac] = packMac(mac)
+
+        self._buffer += RECORD.pack(self._clock(), direction, raw, len(data))
+        self._buffer += data
+
+    def takeBuffer(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+
+        return data
+
+    def write(self, data):
+        if not data:
+            return
+
+        if os.path.exists(self._path) and os.path.getsize(self._path) + len(data) > self._maxBytes:
+            self.rotate()
+
+        isNew = not os.path.exists(self._path)
+
+        with open(self._path, 'ab') as file:
+            if isNew:
+                file.write(TRACE_MAGIC)
+
+            file.write(data)
+
+    def rotate(self):
+        for i in range(self._backupCount - 1, 0, -1):
+            source = '%s.%d' % (self._path, i)
+
+            if os.path.exists(source):
+                os.replace(source, '%s.%d' % (self._path, i + 1))
+
+        if self._backupCount > 0:
+            os.replace(self._path, self._path + '.1')
+        else:
+            os.remove(self._path)
+
+    def flush(self):
+        self.write(self.takeBuffer())
+
+    async def async_flush(self, hass):
+        await hass.async_add_executor_job(self.write, self.takeBuffer())
+
+
+def readTrace(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    if not data.startswith(TRACE_MAGIC):
+        raise ValueError('%s is not a ready4sky trace' % path)
+
+    view = memoryview(data)
+    offset = len(TRACE_MAGIC)
+
+    while offset + RECORD.size <= len(view):
+        timestamp, direction, mac, length = RECORD.unpack_from(view, offset)
+        offset += RECORD.size
+
+        yield timestamp, direction, unpackMac(mac), bytes(view[offset:offset + length])
+        offset += length
+
+
+class TraceReplayer:
+    def __init__(self, path):
+        self._path = path
+
+    async def replay(self, connections, realtime=False):
+        connections = {mac.upper(): conn for mac, conn in connections.items()}
+        replayed = 0
+        first = None
+        started = time.monotonic()
+
+        for timestamp, direction, mac, data in readTrace(self._path):
+            conn = connections.get(mac)
+
+            if direction != DIRECTION_IN or conn is None:
+                continue
+
+            if realtime:
+                first = timestamp if first is None else first
+                delay = timestamp - first - (time.monotonic() - started)
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            conn.dispatch(decodeFrame(data))
+            replayed += 1
+
+        _LOGGER.debug('Replayed %d frames from %s', replayed, self._path)
+
+        return replayed
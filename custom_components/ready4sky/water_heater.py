@@ -10,6 +10,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import (
     DOMAIN
 )
+from .profiles import (CAP_COOKER, CAP_KETTLE)
 from .water_heaters.cooker import RedmondCooker
 from .water_heaters.kettle import RedmondKettle
 
@@ -21,10 +22,10 @@ async def async_setup_entry(
 ) -> None:
     kettle = hass.data[DOMAIN][config_entry.entry_id]
 
-    if kettle._type in [0, 1, 2]:
+    if kettle._profile.has(CAP_KETTLE):
         async_add_entities([RedmondKettle(kettle)])
 
-    elif kettle._type == 5:
+    elif kettle._profile.has(CAP_COOKER):
         async_add_entities([RedmondCooker(kettle)])
 
         platform = entity_platform.current_platform.get()
@@ -12,11 +12,11 @@ from homeassistant.helpers.entity import DeviceInfo
 
 from .. import (
     DOMAIN,
-    SIGNAL_UPDATE_DATA,
     STATUS_ON,
     COOKER_STATUS_KEEP_WARM,
     COOKER_STATUS_DELAYED_START,
 )
+from ..entity import RedmondEntity
 from ..r4sconst import COOKER_PROGRAMS
 
 STATE_BOIL = 'boil'
@@ -24,7 +24,9 @@ STATE_KEEP_WARM = 'keep_warm'
 OPERATIONS_LIST = list(COOKER_PROGRAMS.keys())
 OPERATIONS_LIST.append(STATE_OFF)
 
-class RedmondCooker(WaterHeaterEntity):
+class RedmondCooker(RedmondEntity, WaterHeaterEntity):
+    _fields = frozenset(['tgtemp', 'status', 'prog'])
+
     def __init__(self, kettle):
         self._kettle = kettle
         self.entity_description = WaterHeaterEntityEntityDescription(
@@ -49,28 +51,28 @@ class RedmondCooker(WaterHeaterEntity):
         self._attr_supported_features = WaterHeaterEntityFeature.TARGET_TEMPERATURE | WaterHeaterEntityFeature.OPERATION_MODE
 
     async def async_added_to_hass(self):
-        self.update()
-        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, SIGNAL_UPDATE_DATA, self.update))
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
 
     def update(self):
-        self._attr_target_temperature = self._kettle._tgtemp
+        state = self._kettle.state
+
+        self._attr_target_temperature = state.tgtemp
         self._attr_current_operation = STATE_OFF
 
-        if self._kettle._status == STATUS_ON or self._kettle._status == COOKER_STATUS_KEEP_WARM or self._kettle._status == COOKER_STATUS_DELAYED_START:
+        if state.status == STATUS_ON or state.status == COOKER_STATUS_KEEP_WARM or state.status == COOKER_STATUS_DELAYED_START:
             self._attr_current_operation = 'manual'
             for key, value in COOKER_PROGRAMS.items():
-                if value[0] == self._kettle._prog:
+                if value[0] == state.prog:
                     self._attr_current_operation = key
 
-        self.schedule_update_ha_state()
-
     @property
     def should_poll(self):
         return False
 
     @property
     def available(self):
-        return self._kettle._available
+        return self._kettle.state.available
 
     @property
     def extra_state_attributes(self):
@@ -92,15 +94,7 @@ class RedmondCooker(WaterHeaterEntity):
         if prog is None or subprog is None or temp is None or hours is None or minutes is None or dhours is None or dminutes is None or heat is None:
             return
         try:
-            progh = self._kettle.decToHex(prog)
-            subprogh = self._kettle.decToHex(subprog)
-            temph = self._kettle.decToHex(temp)
-            hoursh = self._kettle.decToHex(hours)
-            minutesh = self._kettle.decToHex(minutes)
-            dhoursh = self._kettle.decToHex(dhours)
-            dminutesh = self._kettle.decToHex(dminutes)
-            heath = self._kettle.decToHex(heat)
-            await self._kettle.modeOnCook(progh, subprogh, temph, hoursh, minutesh, dhoursh, dminutesh, heath)
+            await self._kettle.modeOnCook(prog, subprog, temp, hours, minutes, dhours, dminutes, heat)
         except:
             pass
 
@@ -108,9 +102,7 @@ class RedmondCooker(WaterHeaterEntity):
         if hours is None or minutes is None:
             return
         try:
-            hoursh = self._kettle.decToHex(hours)
-            minutesh = self._kettle.decToHex(minutes)
-            await self._kettle.modeTimeCook(hoursh, minutesh)
+            await self._kettle.modeTimeCook(hours, minutes)
         except:
             pass
 
@@ -120,4 +112,4 @@ class RedmondCooker(WaterHeaterEntity):
         if temperature is None:
             return
 
-        await self._kettle.modeTempCook(self._kettle.decToHex(int(temperature)))
+        await self._kettle.modeTempCook(int(temperature))
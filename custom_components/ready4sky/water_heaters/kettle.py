@@ -16,19 +16,21 @@ from homeassistant.helpers.entity import DeviceInfo
 
 from .. import (
     DOMAIN,
-    SIGNAL_UPDATE_DATA,
     CONF_MAX_TEMP,
     CONF_MIN_TEMP,
     MODE_KEEP_WARM,
     MODE_BOIL,
     STATUS_ON
 )
+from ..entity import RedmondEntity
 
 STATE_BOIL = 'boil'
 STATE_KEEP_WARM = 'keep_warm'
 
 
-class RedmondKettle(WaterHeaterEntity):
+class RedmondKettle(RedmondEntity, WaterHeaterEntity):
+    _fields = frozenset(['temp', 'tgtemp', 'status', 'mode'])
+
     def __init__(self, kettle):
         self._kettle = kettle
         self.entity_description = WaterHeaterEntityEntityDescription(
@@ -60,29 +62,29 @@ class RedmondKettle(WaterHeaterEntity):
         )
 
     async def async_added_to_hass(self):
-        self.update()
-        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, SIGNAL_UPDATE_DATA, self.update))
+        self.handleUpdate()
+        self.async_on_remove(async_dispatcher_connect(self._kettle.hass, self._kettle.updateSignal, self.handleUpdate))
 
     def update(self):
-        self._attr_current_temperature = self._kettle._temp
-        self._attr_target_temperature = self._kettle._tgtemp
+        state = self._kettle.state
+
+        self._attr_current_temperature = state.temp
+        self._attr_target_temperature = state.tgtemp
         self._attr_current_operation = STATE_OFF
 
-        if self._kettle._status == STATUS_ON:
-            if self._kettle._mode == MODE_BOIL:
+        if state.status == STATUS_ON:
+            if state.mode == MODE_BOIL:
                 self._attr_current_operation = STATE_BOIL
-            elif self._kettle._mode == MODE_KEEP_WARM:
+            elif state.mode == MODE_KEEP_WARM:
                 self._attr_current_operation = STATE_KEEP_WARM
 
-        self.schedule_update_ha_state()
-
     @property
     def should_poll(self):
         return False
 
     @property
     def available(self):
-        return self._kettle._available
+        return self._kettle.state.available
 
     @property
     def extra_state_attributes(self):
@@ -105,13 +107,13 @@ class RedmondKettle(WaterHeaterEntity):
         if (newTargetTemperature - self.target_temperature) == 1:
             return await self.async_set_operation_mode(STATE_KEEP_WARM)
 
-        self._kettle._tgtemp = newTargetTemperature
-        self.update()
+        self._kettle.setState(tgtemp=newTargetTemperature)
+        self.handleUpdate()
 
         if self.state == STATE_KEEP_WARM:
             await self.async_set_operation_mode(STATE_KEEP_WARM)
         elif self.state == STATE_OFF:
-            await self._kettle.setTemperatureHeat(self._kettle._tgtemp)
+            await self._kettle.setTemperatureHeat(self._kettle.state.tgtemp)
 
     async def async_turn_on(self):
         await self.async_set_operation_mode(STATE_BOIL)